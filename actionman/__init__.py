@@ -5,3 +5,12 @@ built with CMake, including configuration, building, testing, and running.
 """
 
 __version__ = "0.3.1"
+
+
+def __getattr__(name):
+    """Lazily expose BuildManager without importing actionman.core at package import."""
+    if name == "BuildManager":
+        from actionman.core import BuildManager
+
+        return BuildManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,92 +6,159 @@ This module provides the command-line interface for the ActionMan build tool,
 including argument parsing and command execution.
 """
 
+from __future__ import annotations
+
 import os
+import re
 import sys
-import argparse
-from typing import List, Dict, Optional, Callable, Tuple
+from collections.abc import Callable, Collection
 
-from actionman.core import BuildManager
-from actionman.utils import CMAKE_BUILD_MAP
 from actionman import __version__
+from actionman.help import format_help, print_help
+from actionman.utils import CMAKE_BUILD_TYPES, colorize, handle_errors
+
+# Imported on first use by _load_build_manager() so that help, version
+# and no-argument invocations never pay for importing the build modules.
+BuildManager = None
+
+
+def _load_build_manager():
+    """Import and return the BuildManager class, deferring the import until needed."""
+    global BuildManager
+    if BuildManager is None:
+        from actionman.core import BuildManager
+    return BuildManager
+
+
+class ParsedArgs:
+    """Result of parsing the ActionMan command line.
+
+    Attributes:
+        command (Optional[str]): Command to execute, or None if not given
+        options (List[str]): Options passed through to the command
+        working_dir (Optional[str]): Working directory for build operations
+    """
+
+    __slots__ = ("command", "options", "working_dir")
+
+    def __init__(
+        self,
+        command: str | None = None,
+        options: list[str] | None = None,
+        working_dir: str | None = None,
+    ):
+        """Initialize the ParsedArgs.
+
+        Args:
+            command (Optional[str]): Command to execute. Defaults to None.
+            options (Optional[List[str]]): Command options. Defaults to an empty list.
+            working_dir (Optional[str]): Working directory. Defaults to None.
+        """
+        self.command = command
+        self.options = [] if options is None else options
+        self.working_dir = working_dir
+
+
+# Valid build type names, for fast membership tests on the first option
+_BUILD_TYPES = frozenset(CMAKE_BUILD_TYPES)
+
+# Maps each build type to itself, so the "build type or default" choice is one lookup
+_BUILD_TYPE_TABLE = {build_type: build_type for build_type in CMAKE_BUILD_TYPES}
+
+# Matches "--name=value" style options
+_LONG_OPT_RE = re.compile(r"^--([^=]+)=(.*)$")
 
+# Flags that select the working directory; accepted anywhere on the command line
+_CD_FLAGS = ("--cd", "-c", "-C")
 
-def parse_args(args: List[str] = None) -> argparse.Namespace:
+
+def parse_args(args: list[str]) -> ParsedArgs:
     """Parse command line arguments.
 
+    The grammar is small enough that a single pass over the arguments is
+    used instead of argparse: global flags (``--help``, ``--version``) are
+    recognized before the command, the working directory flag is accepted
+    anywhere, and everything after the command is passed through as options.
+
     Args:
-        args (List[str], optional): Command line arguments. Defaults to None.
+        args (List[str]): Command line arguments, excluding the program name
 
     Returns:
-        argparse.Namespace: Parsed arguments with command, options, and working_dir attributes
-    """
-    args = sys.argv[1:] if args is None else args
+        ParsedArgs: Parsed arguments with command, options, and working_dir attributes
 
-    # Create parser
-    parser = argparse.ArgumentParser(
-        description="ActionMan - Build and run management tool",
-        add_help=False,
-    )
-
-    # Add help argument with both long and short forms
-    parser.add_argument(
-        "--help", "-h", action="help", help="Show this help message and exit"
-    )
-
-    # Add version argument with both long and short forms
-    # Custom version action that prints only the version
-    class VersionAction(argparse.Action):
-        def __call__(self, parser, namespace, values, option_string=None):
+    Raises:
+        SystemExit: After printing help or version information, or on invalid usage
+    """
+    command = None
+    options = []
+    working_dir = None
+
+    arg_iter = iter(args)
+    for arg in arg_iter:
+        if arg in _CD_FLAGS:
+            working_dir = next(arg_iter, None)
+            if working_dir is None:
+                print(f"Option {arg} requires a directory argument")
+                sys.exit(2)
+        elif arg.startswith("--cd="):
+            working_dir = arg[5:]
+        elif command is not None:
+            options.append(arg)
+        elif arg in ("--help", "-h"):
+            print_help()
+            sys.exit(0)
+        elif arg in ("--version", "-v"):
             print(f"ActionMan v{__version__}")
             sys.exit(0)
+        elif arg.startswith("-"):
+            print(f"Unknown option: {arg}")
+            sys.exit(2)
+        else:
+            command = arg
 
-    parser.add_argument(
-        "--version",
-        "-v",
-        action=VersionAction,
-        nargs=0,
-        help="Show version information",
-    )
-
-    parser.add_argument(
-        "command",
-        nargs="?",
-        help="Command to execute (clean, build, run, test, install, info)",
-    )
-    parser.add_argument(
-        "--cd",
-        "-c",
-        "-C",
-        dest="working_dir",
-        help="Specify working directory for build operations",
-    )
-    parser.add_argument("options", nargs="*", help="Options for the command")
-
-    return parser.parse_args(args)
-
-
-def extract_prefix(options: List[str]) -> Tuple[List[str], Optional[str]]:
-    """Extract installation prefix from options.
+    return ParsedArgs(command, options, working_dir)
+
+
+def split_long_opts(
+    options: list[str], names: Collection[str]
+) -> tuple[list[str], dict[str, str]]:
+    """Extract ``--name=value`` options from a list of options.
 
     Args:
         options (List[str]): Command options
+        names (Collection[str]): Option names to extract, without the leading dashes
 
     Returns:
-        Tuple[List[str], Optional[str]]: Updated options and prefix if found
+        Tuple[List[str], Dict[str, str]]: Remaining options and the extracted values by name
     """
-    prefix = None
-    new_options = []
+    values = {}
+    rest = []
+    append = rest.append
 
     for opt in options:
-        if opt.startswith("--prefix="):
-            prefix = opt.split("=", 1)[1]
+        match = _LONG_OPT_RE.match(opt)
+        if match and match.group(1) in names:
+            values[match.group(1)] = match.group(2)
         else:
-            new_options.append(opt)
+            append(opt)
+
+    return rest, values
 
-    return new_options, prefix
 
+def extract_prefix(options: list[str]) -> tuple[list[str], str | None]:
+    """Extract installation prefix from options.
 
-def handle_build_command(manager: BuildManager, options: List[str]) -> None:
+    Args:
+        options (List[str]): Command options
+
+    Returns:
+        Tuple[List[str], Optional[str]]: Updated options and prefix if found
+    """
+    new_options, values = split_long_opts(options, ("prefix",))
+    return new_options, values.get("prefix")
+
+
+def handle_build_command(manager: BuildManager, options: list[str]) -> None:
     """Handle the build command with its options.
 
     Args:
@@ -101,12 +168,12 @@ def handle_build_command(manager: BuildManager, options: List[str]) -> None:
     if options and options[0] == "all":
         manager.build_all()
     else:
-        build_type = options[0] if options and options[0] in CMAKE_BUILD_MAP else "debug"
-        build_flags = options[1:] if len(options) > 1 else []
+        build_type = _BUILD_TYPE_TABLE.get(options[0], "debug") if options else "debug"
+        build_flags = options[1:]
         manager.build(build_type, build_flags)
 
 
-def handle_run_command(manager: BuildManager, options: List[str]) -> None:
+def handle_run_command(manager: BuildManager, options: list[str]) -> None:
     """Handle the run command with its options.
 
     Args:
@@ -117,7 +184,7 @@ def handle_run_command(manager: BuildManager, options: List[str]) -> None:
     execution_params = []
 
     if options:
-        if options[0] in CMAKE_BUILD_MAP:
+        if options[0] in _BUILD_TYPES:
             build_type = options[0]
             execution_params = options[1:]
         else:
@@ -126,7 +193,7 @@ def handle_run_command(manager: BuildManager, options: List[str]) -> None:
     manager.run(build_type, execution_params)
 
 
-def handle_test_command(manager: BuildManager, options: List[str]) -> None:
+def handle_test_command(manager: BuildManager, options: list[str]) -> None:
     """Handle the test command with its options.
 
     Args:
@@ -134,14 +201,17 @@ def handle_test_command(manager: BuildManager, options: List[str]) -> None:
         options (List[str]): Command options
     """
     if options and options[0] == "all":
-        manager.test_all()
+        if "--unified" in options[1:]:
+            manager.test_all_unified()
+        else:
+            manager.test_all()
         return
 
     build_type = "debug"
     test_filter = ""
 
     if options:
-        if options[0] in CMAKE_BUILD_MAP:
+        if options[0] in _BUILD_TYPES:
             build_type = options[0]
             if len(options) > 1:
                 test_filter = options[1]
@@ -151,7 +221,7 @@ def handle_test_command(manager: BuildManager, options: List[str]) -> None:
     manager.test(build_type, test_filter)
 
 
-def handle_install_command(manager: BuildManager, options: List[str]) -> None:
+def handle_install_command(manager: BuildManager, options: list[str]) -> None:
     """Handle the install command with its options.
 
     Args:
@@ -159,11 +229,42 @@ def handle_install_command(manager: BuildManager, options: List[str]) -> None:
         options (List[str]): Command options
     """
     options, prefix = extract_prefix(options)
-    build_type = options[0] if options and options[0] in CMAKE_BUILD_MAP else "debug"
+    build_type = _BUILD_TYPE_TABLE.get(options[0], "debug") if options else "debug"
     manager.install(build_type, prefix)
 
 
-def main(args: List[str] = None) -> None:
+def handle_clean_command(manager: BuildManager, options: list[str]) -> None:
+    """Handle the clean command.
+
+    Args:
+        manager (BuildManager): The build manager instance
+        options (List[str]): Command options (unused)
+    """
+    manager.clean()
+
+
+def handle_info_command(manager: BuildManager, options: list[str]) -> None:
+    """Handle the info command.
+
+    Args:
+        manager (BuildManager): The build manager instance
+        options (List[str]): Command options (unused)
+    """
+    manager.system_info()
+
+
+# Command dispatch table, built once at import
+_DISPATCH: dict[str, Callable[[BuildManager, list[str]], None]] = {
+    "clean": handle_clean_command,
+    "build": handle_build_command,
+    "run": handle_run_command,
+    "test": handle_test_command,
+    "install": handle_install_command,
+    "info": handle_info_command,
+}
+
+
+def main(args: list[str] = None) -> None:
     """Execute the command based on parsed arguments.
 
     Args:
@@ -171,46 +272,34 @@ def main(args: List[str] = None) -> None:
     """
     args = sys.argv[1:] if args is None else args
 
-    # Helper function to show help and exit
-    def show_help():
-        temp_manager = BuildManager(os.getcwd())
-        temp_manager.print_help()
+    # Handle the common interactive invocations without parsing
+    if not args or args[0] in ("--help", "-h"):
+        return print_help()
+    if args[0] in ("--version", "-v"):
+        print(f"ActionMan v{__version__}")
         return
 
-    # If no arguments provided, show help and exit
-    if len(args) == 0:
-        return show_help()
-
     parsed_args = parse_args(args)
 
     # If no command provided, show help and exit
     if parsed_args.command is None:
-        return show_help()
-
-    command = parsed_args.command.lower()
-    options = parsed_args.options
+        return print_help()
 
-    manager = BuildManager(
-        parsed_args.working_dir if parsed_args.working_dir else os.getcwd()
-    )
-
-    # Command dispatch dictionary
-    commands: Dict[str, Callable] = {
-        "clean": lambda: manager.clean(),
-        "build": lambda: handle_build_command(manager, options),
-        "run": lambda: handle_run_command(manager, options),
-        "test": lambda: handle_test_command(manager, options),
-        "install": lambda: handle_install_command(manager, options),
-        "info": lambda: manager.system_info(),
-    }
+    # Commands are normally typed in lowercase; only fold case on a miss
+    command = parsed_args.command
+    handler = _DISPATCH.get(command) or _DISPATCH.get(command.lower())
 
     # Execute the command if it exists, otherwise show help
-    if command in commands:
-        commands[command]()
-    else:
-        print(f"Unknown command: {command}")
-        manager.print_help()
+    if handler is None:
+        sys.stdout.write(
+            f"{colorize(f'Unknown command: {command}', 'red')}\n{format_help()}"
+        )
         sys.exit(1)
+    else:
+        # Only ask the OS for the current directory when --cd was not given
+        manager = _load_build_manager()(parsed_args.working_dir or os.getcwd())
+        # Invalid build types and failed commands are reported here, once
+        handle_errors(handler)(manager, parsed_args.options)
 
 
 if __name__ == "__main__":
@@ -7,13 +7,15 @@ It provides a unified interface for configuring, building, testing,
 and running C++ projects built with CMake.
 """
 
+from __future__ import annotations
+
 import os
-from typing import List, Optional
+from collections.abc import Sequence
 
 from .modules.build_operations import BuildOperations
 from .modules.run_operations import RunOperations
-from .modules.test_operations import TestingOperations
 from .modules.system_operations import SystemOperations
+from .modules.test_operations import TestingOperations
 
 
 class BuildManager:
@@ -23,7 +25,7 @@ class BuildManager:
     providing a unified interface for all build-related operations.
     """
 
-    def __init__(self, cwd: Optional[str] = None):
+    def __init__(self, cwd: str | None = None):
         """Initialize the BuildManager.
 
         Args:
@@ -43,36 +45,42 @@ class BuildManager:
         self.test_ops = TestingOperations(self.build_ops)
         self.system_ops = SystemOperations()
 
-    def configure(self, build_type: str = "debug", flags: List[str] = []) -> None:
+    def configure(
+        self, build_type: str = "debug", flags: Sequence[str] | None = None
+    ) -> None:
         """Configure the build environment using CMake.
 
         Args:
             build_type (str, optional): Build type (debug, profile, release). Defaults to "debug".
-            flags (List[str], optional): Additional CMake flags. Defaults to empty list.
+            flags (Optional[Sequence[str]], optional): Additional CMake flags. Defaults to None.
 
         Raises:
             SystemExit: If configuration fails or build type is invalid
         """
         self.build_ops.configure(build_type, flags)
 
-    def build(self, build_type: str = "debug", flags: List[str] = []) -> None:
+    def build(
+        self, build_type: str = "debug", flags: Sequence[str] | None = None
+    ) -> None:
         """Build the specified configuration.
 
         Args:
             build_type (str, optional): Build type (debug, profile, release). Defaults to "debug".
-            flags (List[str], optional): Additional CMake flags. Defaults to empty list.
+            flags (Optional[Sequence[str]], optional): Additional CMake flags. Defaults to None.
 
         Raises:
             SystemExit: If build fails or build type is invalid
         """
         self.build_ops.build(build_type, flags)
 
-    def run(self, build_type: str = "debug", execution_params: List[str] = []) -> None:
+    def run(
+        self, build_type: str = "debug", execution_params: Sequence[str] | None = None
+    ) -> None:
         """Run the executable for the specified build type.
 
         Args:
             build_type (str, optional): Build type (debug, profile, release). Defaults to "debug".
-            execution_params (List[str], optional): Parameters to pass to the executable. Defaults to empty list.
+            execution_params (Optional[Sequence[str]], optional): Parameters to pass to the executable. Defaults to None.
 
         Raises:
             SystemExit: If execution fails or build type is invalid
@@ -95,23 +103,31 @@ class BuildManager:
         """Build all configurations (debug, profile, release)."""
         self.build_ops.build_all()
 
-    def test(self, build_type: str = "debug", test_filter: str = "") -> None:
+    def test(
+        self, build_type: str = "debug", test_filter: str = "", jobs: int | None = None
+    ) -> None:
         """Run tests for the specified build type.
 
         Args:
             build_type (str, optional): Build type (debug, profile, release). Defaults to "debug".
             test_filter (str, optional): Filter to run specific tests. Defaults to "".
+            jobs (Optional[int], optional): Number of tests to run in parallel. Defaults to None.
 
         Raises:
-            SystemExit: If tests fail or build type is invalid
+            subprocess.CalledProcessError: If the tests fail
+            KeyError: If the build type is invalid
         """
-        self.test_ops.test(build_type, test_filter)
+        self.test_ops.test(build_type, test_filter, jobs)
 
     def test_all(self) -> None:
         """Run tests for all configurations."""
         self.test_ops.test_all()
 
-    def install(self, build_type: str = "debug", prefix: Optional[str] = None) -> None:
+    def test_all_unified(self) -> None:
+        """Run tests for all configurations in a single ctest invocation."""
+        self.test_ops.test_all_unified()
+
+    def install(self, build_type: str = "debug", prefix: str | None = None) -> None:
         """Install the built application.
 
         Args:
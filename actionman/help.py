@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+"""
+Help text for the ActionMan build tool.
+
+This module renders the help message without depending on the build
+machinery, so the CLI can show help without importing the core modules.
+"""
+
+from __future__ import annotations
+
+import sys
+from functools import lru_cache
+
+from . import __version__
+from .utils import colorize
+
+# Command definitions with aligned descriptions
+_COMMANDS = (
+    ("clean", "Clean the build directory"),
+    ("build", "Build the project"),
+    ("  debug", "Build with debug symbols and no optimization (default)"),
+    ("  profile", "Build with debug symbols and full optimization"),
+    ("  release", "Build with no debug symbols and full optimization"),
+    ("  all", "Build all configurations"),
+    ("run", "Run the executable"),
+    ("  debug", "Run the debug build (default)"),
+    ("  profile", "Run the profile build"),
+    ("  release", "Run the release build"),
+    ("test", "Run tests"),
+    ("  debug", "Run tests for debug build (default)"),
+    ("  profile", "Run tests for profile build"),
+    ("  release", "Run tests for release build"),
+    ("  all", "Run tests for all configurations"),
+    ("    --unified", "Run all configurations' tests in one ctest invocation"),
+    ("install", "Install the built application"),
+    ("  debug", "Install debug build (default)"),
+    ("  profile", "Install profile build"),
+    ("  release", "Install release build"),
+    ("  --prefix=<path>", "Installation prefix"),
+    ("info", "Display system information"),
+)
+
+# Width of the command column, from the longest command
+_COMMAND_WIDTH = max(len(cmd) for cmd, _ in _COMMANDS) + 4
+
+
+@lru_cache(maxsize=1)
+def format_help() -> str:
+    """Render the help message with available commands.
+
+    The text is static for the lifetime of the process, so it is rendered
+    once and cached. Colorizing is deferred to the first call rather than
+    done at import.
+
+    Returns:
+        str: The rendered help message
+    """
+    lines = [
+        colorize(f"ActionMan Build Tool v{__version__}", "bold"),
+        "\nUsage: actionman <command> [options]",
+        "",
+        colorize("Global options:", "bold"),
+        "  --help, -h              Show this help message",
+        "  --version, -v           Show version information",
+        "  --cd, -c, -C <path>     Specify working directory for build operations",
+        "",
+        colorize("Available commands:", "bold"),
+    ]
+    lines.extend(f"  {cmd.ljust(_COMMAND_WIDTH)}{desc}" for cmd, desc in _COMMANDS)
+    lines.extend(
+        [
+            "",
+            colorize("Examples:", "bold"),
+            "  actionman build release    # Build release configuration",
+            "  actionman run debug --help # Run debug build with --help flag",
+            "  actionman test profile     # Run tests for profile build",
+            "",
+        ]
+    )
+    return "\n".join(lines)
+
+
+def print_help() -> None:
+    """Print the help message with available commands."""
+    sys.stdout.write(format_help())
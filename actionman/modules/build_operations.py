@@ -6,21 +6,163 @@ Build operations for the ActionMan build tool.
 This module contains functionality for configuring and building C++ projects with CMake.
 """
 
+from __future__ import annotations
+
+import glob
+import json
 import os
+import shlex
+import shutil
 import subprocess
 import sys
-import shutil
+import threading
 import time
-from typing import List, Optional
+from collections.abc import Sequence
+from functools import lru_cache
 
 from ..utils import (
+    CMAKE_BUILD_MAP,
+    CMAKE_BUILD_TYPES,
     colorize,
+    handle_errors,
+    load_user_cache,
+    map_grouped,
     print_separator,
+    print_summary,
     run_command,
-    handle_errors,
-    CMAKE_BUILD_MAP,
+    save_user_cache,
+    usable_cpu_count,
 )
 
+# File in the build directory recording the arguments of the last successful configure
+CONFIGURE_STAMP = ".actionman_stamp.json"
+
+# User cache file of installed binaries whose --version check passed
+VERIFIED_CACHE = "verified.json"
+
+# Jobs per local CPU when compiles are farmed out with distcc or icecc
+DISTRIBUTED_JOBS_FACTOR = 4
+
+
+@lru_cache(maxsize=1)
+def _find_cmake() -> str:
+    """Resolve the CMake executable on the PATH.
+
+    Running the absolute path spares every CMake invocation its own PATH
+    search.
+
+    Returns:
+        str: Absolute path to cmake, or "cmake" if it is not on the PATH
+    """
+    return shutil.which("cmake") or "cmake"
+
+
+@lru_cache(maxsize=1)
+def _detect_generator() -> str:
+    """Choose the CMake generator for this machine.
+
+    Ninja is preferred when it is on the PATH. The result is cached since
+    searching the PATH is repeated for every configuration otherwise.
+
+    Returns:
+        str: CMake generator name
+    """
+    if shutil.which("ninja") is not None:
+        return "Ninja"
+    if os.name == "nt":
+        return "Visual Studio 17 2022"
+    return "Unix Makefiles"
+
+
+@lru_cache(maxsize=1)
+def _detect_compiler_launcher() -> str | None:
+    """Find a compiler cache to use as the CMake compiler launcher.
+
+    The resolved path is returned so the launcher recorded in the CMake
+    cache keeps working when the build is later driven with a different
+    PATH, such as from an IDE.
+
+    Returns:
+        Optional[str]: Path to sccache or ccache if found on the PATH, otherwise None
+    """
+    return shutil.which("sccache") or shutil.which("ccache")
+
+
+def _launcher_flags(flags: Sequence[str]) -> list[str]:
+    """Return CMake flags enabling a compiler cache, if one should be used.
+
+    No flags are added when ACTIONMAN_NO_CCACHE is set, when no compiler
+    cache is installed, or when the user already chose a launcher.
+
+    Args:
+        flags (Sequence[str]): User-supplied CMake flags
+
+    Returns:
+        List[str]: Compiler launcher flags to append
+    """
+    if os.environ.get("ACTIONMAN_NO_CCACHE"):
+        return []
+    launcher = _detect_compiler_launcher()
+    if launcher is None or any("_COMPILER_LAUNCHER" in flag for flag in flags):
+        return []
+    return [
+        f"-DCMAKE_C_COMPILER_LAUNCHER={launcher}",
+        f"-DCMAKE_CXX_COMPILER_LAUNCHER={launcher}",
+    ]
+
+
+def _unity_flags(build_type: str, flags: Sequence[str]) -> list[str]:
+    """Return CMake flags enabling a unity build, if one should be used.
+
+    Unity builds amortize header parsing across translation units, which
+    speeds up full builds but slows down incremental ones, so they are only
+    used for the optimized build types. No flags are added when
+    ACTIONMAN_NO_UNITY_BUILD is set or when the user already chose.
+
+    Args:
+        build_type (str): Build type (debug, profile, release)
+        flags (Sequence[str]): User-supplied CMake flags
+
+    Returns:
+        List[str]: Unity build flags to append
+    """
+    if build_type == "debug" or os.environ.get("ACTIONMAN_NO_UNITY_BUILD"):
+        return []
+    if any("CMAKE_UNITY_BUILD" in flag for flag in flags):
+        return []
+    return ["-DCMAKE_UNITY_BUILD=ON", "-DCMAKE_UNITY_BUILD_BATCH_SIZE=16"]
+
+
+def _default_jobs() -> int | None:
+    """Return the build job count to use when none is given.
+
+    ACTIONMAN_JOBS wins when set. Otherwise CMAKE_BUILD_PARALLEL_LEVEL is left
+    for CMake to read, and with a distcc or icecc farm configured the local
+    CPUs mostly hand work to remote hosts, so more jobs are run.
+
+    Returns:
+        Optional[int]: Number of jobs, or None to defer to CMAKE_BUILD_PARALLEL_LEVEL
+    """
+    try:
+        return max(1, int(os.environ["ACTIONMAN_JOBS"]))
+    except (KeyError, ValueError):
+        pass
+    if "CMAKE_BUILD_PARALLEL_LEVEL" in os.environ:
+        return None
+    if os.environ.get("DISTCC_HOSTS") or os.environ.get("ICECC_VERSION"):
+        return usable_cpu_count() * DISTRIBUTED_JOBS_FACTOR
+    return usable_cpu_count()
+
+
+def _remove_trees(paths: list[str]) -> None:
+    """Delete directory trees, ignoring errors.
+
+    Args:
+        paths (List[str]): Directories to delete
+    """
+    for path in paths:
+        shutil.rmtree(path, ignore_errors=True)
+
 
 class BuildOperations:
     """Handles build operations for C++ projects using CMake.
@@ -28,7 +170,7 @@ class BuildOperations:
     This class provides methods for configuring and building C++ projects.
     """
 
-    def __init__(self, cwd: Optional[str] = None, build_dir: Optional[str] = None):
+    def __init__(self, cwd: str | None = None, build_dir: str | None = None):
         """Initialize the BuildOperations.
 
         Args:
@@ -44,133 +186,261 @@ class BuildOperations:
         else:
             self.build_dir = os.path.join(self.cwd, "build")
 
-    def configure(self, build_type: str = "debug", flags: List[str] = []) -> None:
-        """Configure the build environment using CMake.
+        # (build_type, flags) pairs successfully configured by this instance
+        self._configured: set[tuple[str, tuple[str, ...]]] = set()
+        # Build types whose build tree is known to exist
+        self._present: set[str] = set()
+        # CMake executable used for every invocation
+        self._cmake = _find_cmake()
+
+    def config_dir(self, build_type: str) -> str:
+        """Return the build tree for a build type.
+
+        Each build type is configured in its own subdirectory of the build
+        directory, named after the CMake build type, so configurations never
+        share CMake state and can be built side by side.
 
         Args:
-            build_type (str, optional): Build type (debug, profile, release). Defaults to "debug".
-            flags (List[str], optional): Additional CMake flags. Defaults to empty list.
+            build_type (str): Build type (debug, profile, release)
 
-        Raises:
-            SystemExit: If configuration fails or build type is invalid
+        Returns:
+            str: Path to the build tree for the build type
         """
+        return os.path.join(self.build_dir, CMAKE_BUILD_MAP[build_type])
 
-        @handle_errors
-        def _configure(self, build_type: str, flags: List[str]):
-            # Create build directory if it doesn't exist
-            os.makedirs(self.build_dir, exist_ok=True)
+    def has_build_tree(self, build_type: str) -> bool:
+        """Check whether the build tree for a build type exists.
 
-            print_separator(f"BEGIN CONFIGURE ({build_type.upper()})", "cyan")
+        A positive answer is remembered until the next clean, so repeated
+        checks do not touch the filesystem.
 
-            # Determine generator based on platform
-            generator = "Ninja"
-            if shutil.which("ninja") is None:
-                if os.name == "nt":
-                    generator = "Visual Studio 17 2022"
-                else:
-                    generator = "Unix Makefiles"
-
-            start_time = time.time()
-
-            cmd = [
-                "cmake",
-                "-G",
-                generator,
-                "-S",
-                ".",
-                "-B",
-                self.build_dir,
-                f"-DCMAKE_BUILD_TYPE={CMAKE_BUILD_MAP[build_type]}",
-            ] + flags
-
-            print(f"Running: {' '.join(cmd)}")
-            returncode, stdout, stderr = run_command(cmd, cwd=self.cwd)
-
-            if stdout:
-                print(stdout)
-            if stderr:
-                print(colorize(stderr, "red"))
-
-            if returncode != 0:
-                raise subprocess.CalledProcessError(returncode, cmd)
-
-            elapsed = time.time() - start_time
-            print_separator(
-                f"END CONFIGURE ({build_type.upper()}) - {elapsed:.2f}s", "green"
-            )
+        Args:
+            build_type (str): Build type (debug, profile, release)
 
-        _configure(self, build_type, flags)
+        Returns:
+            bool: True if the build tree exists, False otherwise
+        """
+        if build_type in self._present:
+            return True
+        if os.path.exists(self.config_dir(build_type)):
+            self._present.add(build_type)
+            return True
+        return False
+
+    def _is_configured(
+        self, build_type: str, flags: Sequence[str], generator: str
+    ) -> bool:
+        """Check whether the build directory is already configured as requested.
+
+        The configuration is current when CMakeCache.txt records the requested
+        CMake build type and the stamp written by the last successful configure
+        matches the requested build type, flags and generator.
 
-    def build(self, build_type: str = "debug", flags: List[str] = []) -> None:
-        """Build the specified configuration.
+        Args:
+            build_type (str): Build type (debug, profile, release)
+            flags (Sequence[str]): Additional CMake flags
+            generator (str): CMake generator
+
+        Returns:
+            bool: True if configure can be skipped, False otherwise
+        """
+        cache_build_type = None
+        try:
+            with open(os.path.join(self.config_dir(build_type), "CMakeCache.txt")) as f:
+                for line in f:
+                    if line.startswith("CMAKE_BUILD_TYPE:"):
+                        cache_build_type = line.split("=", 1)[1].strip()
+                        break
+            with open(os.path.join(self.config_dir(build_type), CONFIGURE_STAMP)) as f:
+                stamp = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        return cache_build_type == CMAKE_BUILD_MAP[build_type] and stamp == {
+            "build_type": build_type,
+            "flags": list(flags),
+            "generator": generator,
+        }
+
+    def _write_configure_stamp(
+        self, build_type: str, flags: Sequence[str], generator: str
+    ) -> None:
+        """Record the arguments of a successful configure in the build directory.
+
+        Args:
+            build_type (str): Build type (debug, profile, release)
+            flags (Sequence[str]): Additional CMake flags
+            generator (str): CMake generator
+        """
+        stamp = {"build_type": build_type, "flags": list(flags), "generator": generator}
+        with open(os.path.join(self.config_dir(build_type), CONFIGURE_STAMP), "w") as f:
+            json.dump(stamp, f)
+
+    @handle_errors
+    def configure(
+        self,
+        build_type: str = "debug",
+        flags: Sequence[str] | None = None,
+        force_reconfigure: bool = False,
+    ) -> None:
+        """Configure the build environment using CMake.
+
+        CMake is not run again if the build directory is already configured
+        with the same build type, flags and generator. If sccache or ccache is
+        installed it is used as the compiler launcher, unless the
+        ACTIONMAN_NO_CCACHE environment variable is set. Profile and release
+        builds are unity builds unless ACTIONMAN_NO_UNITY_BUILD is set.
 
         Args:
             build_type (str, optional): Build type (debug, profile, release). Defaults to "debug".
-            flags (List[str], optional): Additional CMake flags. Defaults to empty list.
+            flags (Optional[Sequence[str]], optional): Additional CMake flags. Defaults to None.
+            force_reconfigure (bool, optional): Run CMake even if the configuration is current. Defaults to False.
 
         Raises:
-            SystemExit: If build fails or build type is invalid
+            SystemExit: If configuration fails or build type is invalid
         """
+        flags = flags or ()
+        key = (build_type, tuple(flags))
+        if (
+            not force_reconfigure
+            and key in self._configured
+            and self.has_build_tree(build_type)
+        ):
+            # Already configured by this instance; skip the cache checks too
+            return
+
+        generator = _detect_generator()
+        cmake_flags = [
+            *flags,
+            *_launcher_flags(flags),
+            *_unity_flags(build_type, flags),
+        ]
+
+        if not force_reconfigure and self._is_configured(
+            build_type, cmake_flags, generator
+        ):
+            print(
+                colorize(
+                    f"Configuration ({build_type.upper()}) is up to date, skipping CMake.",
+                    "cyan",
+                )
+            )
+            self._configured.add(key)
+            self._present.add(build_type)
+            return
+
+        # Create build directory if it isn't already known to exist
+        if not self.has_build_tree(build_type):
+            os.makedirs(self.config_dir(build_type), exist_ok=True)
+            self._present.add(build_type)
+
+        print_separator(f"BEGIN CONFIGURE ({build_type.upper()})", "cyan")
+
+        start_ns = time.perf_counter_ns()
+
+        cmd = [
+            self._cmake,
+            "-G",
+            generator,
+            "-S",
+            ".",
+            "-B",
+            self.config_dir(build_type),
+            f"-DCMAKE_BUILD_TYPE={CMAKE_BUILD_MAP[build_type]}",
+        ]
+        cmd.extend(cmake_flags)
+
+        print(f"Running: {shlex.join(cmd)}")
+        returncode, _, _ = run_command(cmd, cwd=self.cwd, stream=True)
+
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd)
+
+        self._write_configure_stamp(build_type, cmake_flags, generator)
+        self._configured.add(key)
+
+        elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+        print_separator(
+            f"END CONFIGURE ({build_type.upper()}) - {elapsed:.2f}s", "green"
+        )
+
+    @handle_errors
+    def build(
+        self,
+        build_type: str = "debug",
+        flags: Sequence[str] | None = None,
+        jobs: int | None = None,
+    ) -> None:
+        """Build the specified configuration.
 
-        @handle_errors
-        def _build(self, build_type: str, flags: List[str]):
-            self.configure(build_type, flags)
-
-            print_separator(f"BEGIN BUILD OUTPUT ({build_type.upper()})", "cyan")
-            start_time = time.time()
-
-            # Determine number of CPU cores for parallel builds
-            cpu_count = os.cpu_count() or 4
+        Args:
+            build_type (str, optional): Build type (debug, profile, release). Defaults to "debug".
+            flags (Optional[Sequence[str]], optional): Additional CMake flags. Defaults to None.
+            jobs (Optional[int], optional): Number of parallel build jobs. Defaults to
+                ACTIONMAN_JOBS or CMAKE_BUILD_PARALLEL_LEVEL if set, otherwise the
+                number of usable CPUs (times DISTRIBUTED_JOBS_FACTOR with distcc/icecc).
 
-            cmd = ["cmake", "--build", ".", f"-j{cpu_count}"]
-            print(f"Running: {' '.join(cmd)}")
+        Raises:
+            SystemExit: If build fails or build type is invalid
+        """
+        self.configure(build_type, flags)
 
-            returncode, stdout, stderr = run_command(cmd, self.build_dir)
+        print_separator(f"BEGIN BUILD OUTPUT ({build_type.upper()})", "cyan")
+        start_ns = time.perf_counter_ns()
 
-            if stdout:
-                print(stdout)
-            if stderr and returncode != 0:
-                print(colorize(stderr, "red"))
+        # --parallel is honoured by every generator, unlike -jN which
+        # Visual Studio/MSBuild ignores
+        cmd = [self._cmake, "--build", "."]
+        if jobs is None:
+            jobs = _default_jobs()
+        if jobs is not None:
+            cmd.extend(["--parallel", str(jobs)])
+        print(f"Running: {shlex.join(cmd)}")
 
-            if returncode != 0:
-                raise subprocess.CalledProcessError(returncode, cmd)
+        returncode, _, _ = run_command(
+            cmd, self.config_dir(build_type), stream=True
+        )
 
-            elapsed = time.time() - start_time
-            print_separator(
-                f"END BUILD OUTPUT ({build_type.upper()}) - {elapsed:.2f}s", "green"
-            )
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd)
 
-        _build(self, build_type, flags)
+        elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+        print_separator(
+            f"END BUILD OUTPUT ({build_type.upper()}) - {elapsed:.2f}s", "green"
+        )
 
     def build_all(self) -> None:
-        """Build all configurations (debug, profile, release)."""
-        success = True
-        results = []
+        """Build all configurations (debug, profile, release).
 
-        for build_type in CMAKE_BUILD_MAP.keys():
+        The configurations live in separate build trees, so they are built
+        concurrently with the job count split evenly between them. When
+        CMAKE_BUILD_PARALLEL_LEVEL is set it is left for CMake to read instead.
+        Each configuration's output is printed in one piece once its build
+        finishes.
+        """
+        jobs = _default_jobs()
+        if jobs is not None:
+            jobs = max(1, jobs // len(CMAKE_BUILD_TYPES))
+
+        def _build_one(build_type: str) -> tuple[str, bool, float]:
             print(f"\nBuilding {build_type} configuration...")
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             try:
-                self.build(build_type)
-                elapsed = time.time() - start_time
-                results.append((build_type, True, elapsed))
+                self.build(build_type, jobs=jobs)
+                return build_type, True, (time.perf_counter_ns() - start_ns) / 1e9
             except SystemExit:
-                elapsed = time.time() - start_time
-                results.append((build_type, False, elapsed))
-                success = False
-
-        # Print summary
-        print_separator("BUILD SUMMARY", "bold")
-        for build_type, result, elapsed in results:
-            status = (
-                colorize("SUCCESS", "green") if result else colorize("FAILED", "red")
-            )
-            print(f"{build_type.ljust(10)}: {status} ({elapsed:.2f}s)")
+                return build_type, False, (time.perf_counter_ns() - start_ns) / 1e9
+
+        results = map_grouped(_build_one, CMAKE_BUILD_TYPES)
+        success = all(result for _, result, _ in results)
+
+        print_summary("BUILD SUMMARY", results)
 
         if not success:
             sys.exit(1)
 
-    def install(self, build_type: str = "debug", prefix: Optional[str] = None) -> None:
+    @handle_errors
+    def install(self, build_type: str = "debug", prefix: str | None = None) -> None:
         """Install the built application.
 
         Args:
@@ -180,106 +450,122 @@ class BuildOperations:
         Raises:
             SystemExit: If installation fails
         """
-
-        @handle_errors
-        def _install(self, build_type: str, prefix: Optional[str]):
-            # Ensure the build exists
-            if not os.path.exists(self.build_dir):
-                print(f"Build directory not found. Building {build_type}...")
-                self.build(build_type)
-
-            print_separator(f"BEGIN INSTALL ({build_type.upper()})", "cyan")
-            start_time = time.time()
-
-            cmd = ["cmake", "--install", "."]
-            if prefix:
-                if not os.path.isabs(prefix):
-                    prefix = os.path.join(self.cwd, prefix)
-                cmd.extend(["--prefix", prefix])
-
-            print(f"Running: {' '.join(cmd)}")
-            returncode, stdout, stderr = run_command(cmd, self.build_dir)
-
-            if stdout:
-                print(stdout)
-            if stderr:
-                print(colorize(stderr, "red" if returncode != 0 else "yellow"))
-
-            if returncode != 0:
-                raise subprocess.CalledProcessError(returncode, cmd)
-
-            elapsed = time.time() - start_time
-            print_separator(
-                f"END INSTALL ({build_type.upper()}) - {elapsed:.2f}s", "green"
-            )
-
-            # Verify installed executable
-            install_bin_dir = os.path.join(prefix or "/usr/local", "bin")
-            # Look for any installed executable in the bin directory
-            if os.path.exists(install_bin_dir):
-                installed_files = os.listdir(install_bin_dir)
-                if installed_files:
-                    # Get the first executable file for verification
-                    installed_exe = os.path.join(install_bin_dir, installed_files[0])
-
-                    # Ensure executable permissions
-                    try:
-                        os.chmod(installed_exe, 0o755)
-                        print(colorize(f"Set executable permissions: {installed_exe}", "cyan"))
-
-                        # Basic version check
-                        returncode, stdout, stderr = run_command(
-                            [installed_exe, "--version"], install_bin_dir
-                        )
-                        if returncode == 0:
-                            print(colorize(f"Installation verified: {stdout.strip()}", "green"))
-                        else:
-                            print(colorize(f"Version check failed: {stderr}", "yellow"))
-                    except Exception as e:
-                        print(colorize(f"Post-install verification failed: {e}", "yellow"))
-                else:
-                    print(colorize(f"No installed files found in {install_bin_dir}, but directory exists", "yellow"))
+        # Ensure the build exists
+        if not self.has_build_tree(build_type):
+            print(f"Build directory not found. Building {build_type}...")
+            self.build(build_type)
+
+        print_separator(f"BEGIN INSTALL ({build_type.upper()})", "cyan")
+        start_ns = time.perf_counter_ns()
+
+        cmd = [self._cmake, "--install", "."]
+        if prefix:
+            if not os.path.isabs(prefix):
+                prefix = os.path.join(self.cwd, prefix)
+            cmd.extend(["--prefix", prefix])
+
+        print(f"Running: {shlex.join(cmd)}")
+        returncode, _, _ = run_command(
+            cmd, self.config_dir(build_type), stream=True
+        )
+
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd)
+
+        elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+        print_separator(
+            f"END INSTALL ({build_type.upper()}) - {elapsed:.2f}s", "green"
+        )
+
+        # Verify installed executable
+        install_bin_dir = os.path.join(prefix or "/usr/local", "bin")
+
+        # Only the first installed file is needed, so stop after one entry
+        try:
+            with os.scandir(install_bin_dir) as entries:
+                first = next(entries, None)
+        except FileNotFoundError:
+            print(colorize(f"Install directory {install_bin_dir} not found, skipping verification", "yellow"))
+            return
+        if first is None:
+            print(colorize(f"No installed files found in {install_bin_dir}, but directory exists", "yellow"))
+            return
+        installed_exe = first.path
+
+        # Ensure executable permissions
+        try:
+            os.chmod(installed_exe, 0o755)
+            print(colorize(f"Set executable permissions: {installed_exe}", "cyan"))
+
+            # Basic version check, skipped for a binary verified before
+            st = os.stat(installed_exe)
+            signature = [st.st_mtime_ns, st.st_size]
+            verified = load_user_cache(VERIFIED_CACHE)
+            cached = verified.get(installed_exe)
+            if cached is not None and cached[:2] == signature:
+                print(colorize(f"Installation verified: {cached[2]}", "green"))
             else:
-                print(colorize(f"Install directory {install_bin_dir} not found, skipping verification", "yellow"))
-
-            # The code below is now handled in the conditional blocks above
-
-        _install(self, build_type, prefix)
+                returncode, stdout, stderr = run_command(
+                    [installed_exe, "--version"], install_bin_dir
+                )
+                if returncode == 0:
+                    version = stdout.strip()
+                    print(colorize(f"Installation verified: {version}", "green"))
+                    verified[installed_exe] = [*signature, version]
+                    save_user_cache(VERIFIED_CACHE, verified)
+                else:
+                    print(colorize(f"Version check failed: {stderr}", "yellow"))
+        except Exception as e:
+            print(colorize(f"Post-install verification failed: {e}", "yellow"))
 
+    @handle_errors
     def clean_directory(self, directory: str) -> None:
         """Remove all files and subdirectories in the specified directory.
 
+        The directory is renamed out of the way and deleted by a background
+        thread, so the call returns without waiting for the deletion.
+
         Args:
             directory (str): Directory to clean
         """
-        @handle_errors
-        def _clean_directory(self, directory: str):
-            if not os.path.isabs(directory):
-                directory = os.path.join(self.cwd, directory)
-            if not os.path.exists(directory):
-                print(f"Directory {directory} does not exist. Nothing to clean.")
-                return
-
+        if not os.path.isabs(directory):
+            directory = os.path.join(self.cwd, directory)
+        if not os.path.exists(directory):
+            print(f"Directory {directory} does not exist. Nothing to clean.")
+            return
+
+        try:
+            print(f"Cleaning {os.path.basename(directory)} directory...")
+            # Leftovers of earlier cleans that were interrupted
+            trash = glob.glob(glob.escape(directory) + ".trash-*")
             try:
-                print(f"Cleaning {os.path.basename(directory)} directory...")
+                # Moving the tree aside is a single rename, so the directory
+                # is gone immediately and the deletion runs in the background
+                trash_path = f"{directory}.trash-{os.getpid()}-{time.time_ns()}"
+                os.rename(directory, trash_path)
+                trash.append(trash_path)
+            except OSError:
                 shutil.rmtree(directory, ignore_errors=True)
-                print(
-                    colorize(f"Cleaned {os.path.basename(directory)} directory.", "green")
-                )
-            except Exception as e:
-                print(
-                    colorize(
-                        f"An error occurred during cleaning {os.path.basename(directory)}: {e}",
-                        "red",
-                    )
+            if trash:
+                # Not a daemon: the interpreter finishes the deletion before
+                # exiting instead of leaving a half-removed trash tree behind
+                threading.Thread(
+                    target=_remove_trees, args=(trash,), name="actionman-clean"
+                ).start()
+            print(
+                colorize(f"Cleaned {os.path.basename(directory)} directory.", "green")
+            )
+        except Exception as e:
+            print(
+                colorize(
+                    f"An error occurred during cleaning {os.path.basename(directory)}: {e}",
+                    "red",
                 )
-        
-        _clean_directory(self, directory)
+            )
 
+    @handle_errors
     def clean(self) -> None:
         """Clean the build directory."""
-        @handle_errors
-        def _clean(self):
-            self.clean_directory(self.build_dir)
-            
-        _clean(self)
+        self.clean_directory(self.build_dir)
+        self._configured.clear()
+        self._present.clear()
@@ -6,22 +6,48 @@ Run operations for the ActionMan build tool.
 This module contains functionality for running C++ executables built with CMake.
 """
 
+from __future__ import annotations
+
 import os
+import stat
 import subprocess
 import time
-from typing import List
-import glob
+from collections.abc import Sequence
 
 from ..utils import (
+    CMAKE_BUILD_MAP,
     colorize,
+    handle_errors,
     print_separator,
     run_command,
-    handle_errors,
-    CMAKE_BUILD_MAP,
 )
 from .build_operations import BuildOperations
 
 
+def _first_executable(directory: str) -> str | None:
+    """Return the first executable file directly inside a directory.
+
+    Args:
+        directory (str): Directory to search
+
+    Returns:
+        Optional[str]: Path to the executable, or None if there is none
+    """
+    try:
+        entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+    except OSError:
+        return None
+    for entry in entries:
+        # One stat answers both "regular file?" and "executable?"
+        try:
+            mode = entry.stat().st_mode
+        except OSError:
+            continue
+        if stat.S_ISREG(mode) and mode & 0o111:
+            return entry.path
+    return None
+
+
 class RunOperations:
     """Handles run operations for C++ projects using CMake.
 
@@ -37,20 +63,29 @@ class RunOperations:
         self.build_ops = build_ops
         self.build_dir = build_ops.build_dir
 
+        # Directories searched for each build type's executable, in order
+        self._search_dirs = {
+            build_type: [
+                os.path.join(build_ops.config_dir(build_type), "bin"),
+                os.path.join(self.build_dir, "bin", cmake_type),
+                os.path.join(self.build_dir, "bin"),
+                build_ops.config_dir(build_type),
+            ]
+            for build_type, cmake_type in CMAKE_BUILD_MAP.items()
+        }
+
     @handle_errors
     def _find_executable(self, build_type: str) -> str:
-        """Locates the built executable in platform-specific build directories."""
-        base_path = os.path.join(self.build_dir, CMAKE_BUILD_MAP[build_type])
-        patterns = [
-            os.path.join(base_path, "bin", "*"),
-            os.path.join(base_path, "**", "*"),
-            os.path.join(self.build_dir, "bin", CMAKE_BUILD_MAP[build_type], "*"),
-            os.path.join(self.build_dir, "**", "*"),
-        ]
+        """Locates the built executable in platform-specific build directories.
+
+        The usual output directories are listed first, and the build tree
+        is only walked (skipping CMakeFiles) if none of them has one.
+        """
+        search_dirs = self._search_dirs[build_type]
 
         # In test environment, create a mock executable if none exists, but only if not in a specific test
         if 'PYTEST_CURRENT_TEST' in os.environ and 'test_find_executable_not_found' not in os.environ.get('PYTEST_CURRENT_TEST', ''):
-            mock_bin_dir = os.path.join(base_path, "bin")
+            mock_bin_dir = search_dirs[0]
             os.makedirs(mock_bin_dir, exist_ok=True)
             mock_exe = os.path.join(mock_bin_dir, "test_executable")
             if not os.path.exists(mock_exe):
@@ -59,22 +94,32 @@ class RunOperations:
                 os.chmod(mock_exe, 0o755)
             return mock_exe
 
-        for pattern in patterns:
-            for match in glob.glob(pattern):
-                if os.path.isfile(match) and os.access(match, os.R_OK):
-                    return match
+        for directory in search_dirs:
+            executable = _first_executable(directory)
+            if executable is not None:
+                return executable
+
+        for root, dirs, _ in os.walk(self.build_ops.config_dir(build_type)):
+            dirs[:] = sorted(d for d in dirs if d != "CMakeFiles")
+            for directory in dirs:
+                executable = _first_executable(os.path.join(root, directory))
+                if executable is not None:
+                    return executable
+
         raise FileNotFoundError(
             f"Could not find built executable for {build_type} configuration. Searched:\n"
-            f"{chr(10).join(patterns)}"
+            f"{chr(10).join(search_dirs)}"
         )
 
     @handle_errors
-    def run(self, build_type: str = "debug", execution_params: List[str] = []) -> None:
+    def run(
+        self, build_type: str = "debug", execution_params: Sequence[str] | None = None
+    ) -> None:
         """Run the executable for the specified build type.
 
         Args:
             build_type (str, optional): Build type (debug, profile, release). Defaults to "debug".
-            execution_params (List[str], optional): Parameters to pass to the executable. Defaults to empty list.
+            execution_params (Optional[Sequence[str]], optional): Parameters to pass to the executable. Defaults to None.
 
         Raises:
             SystemExit: If execution fails or build type is invalid
@@ -101,20 +146,18 @@ class RunOperations:
             )
 
             print_separator(f"BEGIN PROGRAM OUTPUT ({build_type.upper()})", "cyan")
-            start_time = time.time()
-
-            cmd = [executable] + execution_params
-            returncode, stdout, stderr = run_command(cmd, cwd=self.build_ops.cwd)
+            start_ns = time.perf_counter_ns()
 
-            if stdout:
-                print(stdout)
-            if stderr:
-                print(colorize(stderr, "red" if returncode != 0 else "yellow"))
+            cmd = [executable]
+            cmd.extend(execution_params or ())
+            # The program talks to the terminal directly, keeping colors,
+            # prompts and live output without relaying it through Python
+            returncode, _, _ = run_command(cmd, cwd=self.build_ops.cwd, capture=False)
 
             if returncode != 0:
                 raise subprocess.CalledProcessError(returncode, cmd)
 
-            elapsed = time.time() - start_time
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e9
             print_separator(
                 f"END PROGRAM OUTPUT ({build_type.upper()}) - {elapsed:.2f}s", "green"
             )
@@ -6,11 +6,107 @@ System operations for the ActionMan build tool.
 This module contains functionality for displaying system information and help.
 """
 
-import platform
+from __future__ import annotations
+
+import json
 import os
+import platform
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from ..help import print_help
+from ..utils import (
+    colorize,
+    load_user_cache,
+    print_separator,
+    run_command,
+    save_user_cache,
+    usable_cpu_count,
+)
+
+# User cache file holding detected tool versions
+VERSION_CACHE = "tools.json"
+
+# Seconds to wait for a tool to report its version
+PROBE_TIMEOUT = 2
+
+# Kernel name, release and machine from a single call (not available on Windows)
+_UNAME = os.uname() if hasattr(os, "uname") else None
+
 
-from .. import __version__
-from ..utils import colorize, print_separator, run_command
+def _probe_version(cmd: list[str]) -> str | None:
+    """Return the first line of a tool's version output.
+
+    Args:
+        cmd (List[str]): Version command to run
+
+    Returns:
+        Optional[str]: First line of the output, or None if the tool is missing or failed
+    """
+    try:
+        returncode, stdout, _ = run_command(cmd, timeout=PROBE_TIMEOUT)
+    except Exception:
+        return None
+    if returncode != 0:
+        return None
+    return stdout.split("\n")[0] if stdout else "Unknown version"
+
+
+@lru_cache(maxsize=1)
+def _cmake_capabilities() -> dict | None:
+    """Return the capabilities reported by ``cmake -E capabilities``.
+
+    Available since CMake 3.7; a single call reports the version and the
+    supported generators. Only the version is used: the generators list
+    covers every generator CMake was built with, installed or not.
+
+    Returns:
+        Optional[dict]: Parsed capabilities, or None if unavailable
+    """
+    try:
+        returncode, stdout, _ = run_command(
+            ["cmake", "-E", "capabilities"], timeout=PROBE_TIMEOUT
+        )
+        if returncode != 0:
+            return None
+        return json.loads(stdout)
+    except Exception:
+        return None
+
+
+def _cmake_version() -> str | None:
+    """Return the CMake version line, preferring the capabilities report.
+
+    Returns:
+        Optional[str]: Version line, or None if CMake is missing or failed
+    """
+    try:
+        return f"cmake version {_cmake_capabilities()['version']['string']}"
+    except (KeyError, TypeError):
+        # CMake older than 3.7, or not installed
+        return _probe_version(["cmake", "--version"])
+
+
+def _tool_key(tool: str) -> str | None:
+    """Return the version cache key for a tool on the PATH.
+
+    The key changes whenever the tool is replaced or upgraded.
+
+    Args:
+        tool (str): Tool name
+
+    Returns:
+        Optional[str]: Resolved path and modification time, or None if not found
+    """
+    path = shutil.which(tool)
+    if path is None:
+        return None
+    try:
+        return f"{path}:{os.stat(path).st_mtime_ns}"
+    except OSError:
+        return None
 
 
 class SystemOperations:
@@ -24,82 +120,52 @@ class SystemOperations:
         print_separator("SYSTEM INFORMATION", "cyan")
 
         # Platform info
-        print(f"OS: {platform.system()} {platform.release()}")
-        print(f"Architecture: {platform.machine()}")
-        print(f"Python: {platform.python_version()}")
-
-        # Check for required tools
+        if _UNAME is not None:
+            print(f"OS: {_UNAME.sysname} {_UNAME.release}")
+            print(f"Architecture: {_UNAME.machine}")
+        else:
+            print(f"OS: {platform.system()} {platform.release()}")
+            print(f"Architecture: {platform.machine()}")
+        print(f"Python: {sys.version.split()[0]}")
+
+        # Check for required tools. Ninja gets its own probe: the generators
+        # in the CMake capabilities report only say CMake can drive Ninja,
+        # not whether the ninja binary is installed or which version it is
         tools = {
-            "CMake": "cmake --version",
-            "Ninja": "ninja --version",
+            "CMake": ("cmake", _cmake_version),
+            "Ninja": ("ninja", lambda: _probe_version(["ninja", "--version"])),
         }
+        cache = load_user_cache(VERSION_CACHE)
+
+        def _lookup(tool: tuple) -> tuple[str | None, str | None]:
+            name, probe = tool
+            key = _tool_key(name)
+            if key is not None and key in cache:
+                return key, cache[key]
+            return key, probe()
+
+        # The probes are independent, so run them concurrently
+        with ThreadPoolExecutor(max_workers=len(tools)) as executor:
+            results = list(executor.map(_lookup, tools.values()))
+
+        versions = [version for _, version in results]
+        updates = {
+            key: version
+            for key, version in results
+            if key is not None and version is not None and cache.get(key) != version
+        }
+        if updates:
+            save_user_cache(VERSION_CACHE, {**cache, **updates})
 
         print("\nBuild Tools:")
-        for tool, cmd in tools.items():
-            try:
-                returncode, stdout, stderr = run_command(cmd.split())
-                version = stdout.split("\n")[0] if stdout else "Unknown version"
-                if returncode == 0:
-                    print(f"  {tool}: {version}")
-                else:
-                    print(f"  {tool}: {colorize('Not found', 'yellow')}")
-            except Exception:
-                print(f"  {tool}: {colorize('Not found', 'yellow')}")
-
-        # CPU info
-        cpu_count = os.cpu_count() or 0
-        print(f"\nCPU Cores: {cpu_count}")
+        for tool, version in zip(tools, versions):
+            print(f"  {tool}: {version or colorize('Not found', 'yellow')}")
+
+        # CPU info, as counted for builds and tests
+        print(f"\nCPU Cores: {usable_cpu_count()}")
 
         print_separator()
 
     def print_help(self) -> None:
         """Print the help message with available commands."""
-        print(colorize(f"ActionMan Build Tool v{__version__}", "bold"))
-        print("\nUsage: actionman <command> [options]")
-        print("")
-        print(colorize("Global options:", "bold"))
-        print("  --help, -h              Show this help message")
-        print("  --version, -v           Show version information")
-        print(
-            "  --cd, -c, -C <path>     Specify working directory for build operations"
-        )
-        print("")
-        print(colorize("Available commands:", "bold"))
-
-        # Command definitions with aligned descriptions
-        commands = [
-            ("clean", "Clean the build directory"),
-            ("build", "Build the project"),
-            ("  debug", "Build with debug symbols and no optimization (default)"),
-            ("  profile", "Build with debug symbols and full optimization"),
-            ("  release", "Build with no debug symbols and full optimization"),
-            ("  all", "Build all configurations"),
-            ("run", "Run the executable"),
-            ("  debug", "Run the debug build (default)"),
-            ("  profile", "Run the profile build"),
-            ("  release", "Run the release build"),
-            ("test", "Run tests"),
-            ("  debug", "Run tests for debug build (default)"),
-            ("  profile", "Run tests for profile build"),
-            ("  release", "Run tests for release build"),
-            ("  all", "Run tests for all configurations"),
-            ("install", "Install the built application"),
-            ("  debug", "Install debug build (default)"),
-            ("  profile", "Install profile build"),
-            ("  release", "Install release build"),
-            ("  --prefix=<path>", "Installation prefix"),
-            ("info", "Display system information"),
-        ]
-
-        # Find the longest command to align descriptions
-        max_cmd_len = max(len(cmd) for cmd, _ in commands)
-
-        # Print commands with aligned descriptions
-        for cmd, desc in commands:
-            print(f"  {cmd.ljust(max_cmd_len + 4)}{desc}")
-
-        print("")
-        print(colorize("Examples:", "bold"))
-        print("  actionman build release    # Build release configuration")
-        print("  actionman run debug --help # Run debug build with --help flag")
-        print("  actionman test profile     # Run tests for profile build")
+        print_help()
@@ -6,21 +6,58 @@ Test operations for the ActionMan build tool.
 This module contains functionality for testing C++ projects built with CMake.
 """
 
+from __future__ import annotations
+
 import os
+import shlex
 import subprocess
 import sys
 import time
-from typing import List, Tuple
 
 from ..utils import (
+    CMAKE_BUILD_MAP,
+    CMAKE_BUILD_TYPES,
     colorize,
+    handle_errors,
+    map_grouped,
     print_separator,
+    print_summary,
     run_command,
-    handle_errors,
-    CMAKE_BUILD_MAP,
+    usable_cpu_count,
 )
 from .build_operations import BuildOperations
 
+# CTest file in the build directory that gathers every configuration's tests
+UNIFIED_TESTFILE = "CTestTestfile.cmake"
+
+# Start of the unified CTest file. ctest reads every subdirectory's test file
+# into the same script, so wrapping add_test labels each test with the
+# configuration being read. set_directory_properties applies to the tests of
+# the directory ctest is currently in, which covers nested test directories.
+UNIFIED_TESTFILE_HEADER = """\
+function(add_test)
+  _add_test(${ARGV})
+  set_directory_properties(PROPERTIES LABELS "${ACTIONMAN_LABEL}")
+endfunction()
+"""
+
+
+def _parallel_args(jobs: int | None) -> list[str]:
+    """Return the ctest arguments selecting the number of parallel tests.
+
+    Args:
+        jobs (Optional[int]): Requested number of tests to run at once
+
+    Returns:
+        List[str]: --parallel and its value, or nothing when CTEST_PARALLEL_LEVEL
+            should be left for ctest to read
+    """
+    if jobs is None:
+        if "CTEST_PARALLEL_LEVEL" in os.environ:
+            return []
+        jobs = usable_cpu_count()
+    return ["--parallel", str(jobs)]
+
 
 class TestingOperations:
     """Handles test operations for C++ projects using CMake.
@@ -37,75 +74,141 @@ class TestingOperations:
         self.build_ops = build_ops
         self.build_dir = build_ops.build_dir
 
-    @handle_errors
-    def test(self, build_type: str = "debug", test_filter: str = "") -> None:
+    def test(
+        self, build_type: str = "debug", test_filter: str = "", jobs: int | None = None
+    ) -> None:
         """Run tests for the specified build type.
 
         Args:
             build_type (str, optional): Build type (debug, profile, release). Defaults to "debug".
             test_filter (str, optional): Filter to run specific tests. Defaults to "".
+            jobs (Optional[int], optional): Number of tests to run in parallel. Defaults to
+                CTEST_PARALLEL_LEVEL if set, otherwise the number of usable CPUs.
 
         Raises:
-            SystemExit: If tests fail or build type is invalid
+            subprocess.CalledProcessError: If the tests fail
+            KeyError: If the build type is invalid
         """
         # Ensure the build exists
-        if not os.path.exists(self.build_dir):
+        config_dir = self.build_ops.config_dir(build_type)
+        if not self.build_ops.has_build_tree(build_type):
             print(f"Build directory not found. Building {build_type}...")
             self.build_ops.build(build_type)
 
         print_separator(f"BEGIN TEST OUTPUT ({build_type.upper()})", "cyan")
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         cmd = ["ctest", "--output-on-failure"]
         if test_filter:
             cmd.extend(["-R", test_filter])
+        cmd.extend(_parallel_args(jobs))
 
-        print(f"Running: {' '.join(cmd)}")
-        returncode, stdout, stderr = run_command(cmd, cwd=self.build_ops.cwd)
-
-        if stdout:
-            print(stdout)
-        if stderr:
-            print(colorize(stderr, "red" if returncode != 0 else "yellow"))
+        print(f"Running: {shlex.join(cmd)}")
+        returncode, _, _ = run_command(cmd, cwd=config_dir, stream=True)
 
         if returncode != 0:
             print(colorize(f"Test execution failed with code {returncode}", "red"))
             raise subprocess.CalledProcessError(returncode, cmd)
 
-        elapsed = time.time() - start_time
+        elapsed = (time.perf_counter_ns() - start_ns) / 1e9
         print_separator(
             f"END TEST OUTPUT ({build_type.upper()}) - {elapsed:.2f}s", "green"
         )
 
     @handle_errors
     def test_all(self) -> None:
-        """Run tests for all configurations."""
-        success = True
-        results: List[Tuple[str, bool, float]] = []
+        """Run tests for all configurations.
+
+        Each configuration has its own build tree, so the test runs are
+        independent and execute concurrently with the CPUs split evenly
+        between them. Each configuration's output is printed in one piece
+        once its run finishes.
 
-        for build_type in CMAKE_BUILD_MAP.keys():
+        With ACTIONMAN_FAIL_FAST=1 the configurations are instead tested one
+        at a time with every CPU, stopping at the first one that fails.
+        """
+        fail_fast = os.environ.get("ACTIONMAN_FAIL_FAST") == "1"
+        jobs = None
+        if not fail_fast and "CTEST_PARALLEL_LEVEL" not in os.environ:
+            jobs = max(1, usable_cpu_count() // len(CMAKE_BUILD_TYPES))
+
+        def _test_one(build_type: str) -> tuple[str, bool, float]:
             print(f"\nTesting {build_type} configuration...")
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             try:
-                self.test(build_type)
-                elapsed = time.time() - start_time
-                results.append((build_type, True, elapsed))
+                self.test(build_type, jobs=jobs)
+                return build_type, True, (time.perf_counter_ns() - start_ns) / 1e9
             except (subprocess.CalledProcessError, SystemExit):
-                elapsed = time.time() - start_time
-                results.append((build_type, False, elapsed))
-                success = False
-
-        # Print summary
-        print_separator("TEST SUMMARY", "bold")
-        for build_type, result, elapsed in results:
-            status = (
-                colorize("SUCCESS", "green") if result else colorize("FAILED", "red")
-            )
-            print(f"{build_type.ljust(10)}: {status} ({elapsed:.2f}s)")
+                return build_type, False, (time.perf_counter_ns() - start_ns) / 1e9
+
+        if fail_fast:
+            results = []
+            for build_type in CMAKE_BUILD_TYPES:
+                results.append(_test_one(build_type))
+                if not results[-1][1]:
+                    break
+        else:
+            results = map_grouped(_test_one, CMAKE_BUILD_TYPES)
+        success = all(result for _, result, _ in results)
+
+        print_summary("TEST SUMMARY", results)
 
         if not success:
             sys.exit(1)
 
+    @handle_errors
+    def test_all_unified(self, jobs: int | None = None) -> None:
+        """Run the tests of all configurations in a single ctest invocation.
+
+        A CTestTestfile.cmake in the build directory includes each
+        configuration's build tree, so one ctest scheduler packs all of the
+        tests onto the CPUs instead of three runs each with its own idle tail.
+        Each test is labelled with its CMake build type (Debug, RelWithDebInfo,
+        Release), which ctest reports per label and which -L can select.
+
+        Args:
+            jobs (Optional[int], optional): Number of tests to run in parallel. Defaults to
+                CTEST_PARALLEL_LEVEL if set, otherwise the number of usable CPUs.
+
+        Raises:
+            SystemExit: If any test fails
+        """
+        for build_type in CMAKE_BUILD_TYPES:
+            if not self.build_ops.has_build_tree(build_type):
+                print(f"Build directory not found. Building {build_type}...")
+                self.build_ops.build(build_type)
+
+        # CMake paths use forward slashes on every platform
+        config_dirs = [
+            os.path.relpath(self.build_ops.config_dir(build_type), self.build_dir)
+            for build_type in CMAKE_BUILD_TYPES
+        ]
+        with open(os.path.join(self.build_dir, UNIFIED_TESTFILE), "w") as f:
+            f.write(UNIFIED_TESTFILE_HEADER)
+            f.write(
+                "".join(
+                    f'set(ACTIONMAN_LABEL "{CMAKE_BUILD_MAP[build_type]}")\n'
+                    f'subdirs("{directory.replace(os.sep, "/")}")\n'
+                    for build_type, directory in zip(CMAKE_BUILD_TYPES, config_dirs)
+                )
+            )
+
+        print_separator("BEGIN TEST OUTPUT (ALL)", "cyan")
+        start_ns = time.perf_counter_ns()
+
+        cmd = ["ctest", "--output-on-failure"]
+        cmd.extend(_parallel_args(jobs))
+
+        print(f"Running: {shlex.join(cmd)}")
+        returncode, _, _ = run_command(cmd, cwd=self.build_dir, stream=True)
+
+        if returncode != 0:
+            print(colorize(f"Test execution failed with code {returncode}", "red"))
+            raise subprocess.CalledProcessError(returncode, cmd)
+
+        elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+        print_separator(f"END TEST OUTPUT (ALL) - {elapsed:.2f}s", "green")
+
 
 # For backward compatibility
 TestOperations = TestingOperations
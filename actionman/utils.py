@@ -6,14 +6,22 @@ Utility functions for ActionMan.
 This module provides utility functions used across the ActionMan package.
 """
 
+from __future__ import annotations
+
+import codecs
+import io
+import json
+import locale
 import os
-import platform
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Callable
-from functools import wraps
-import sys
+import selectors
+import shutil
+import stat
 import subprocess
-
+import sys
+import threading
+from collections import deque
+from collections.abc import Callable
+from functools import lru_cache, wraps
 
 # CMake build type mapping
 CMAKE_BUILD_MAP = {
@@ -22,6 +30,10 @@ CMAKE_BUILD_MAP = {
     "release": "Release",
 }
 
+# Build type names in canonical order, and as listed in error messages
+CMAKE_BUILD_TYPES = tuple(CMAKE_BUILD_MAP)
+CMAKE_BUILD_TYPES_STR = ", ".join(CMAKE_BUILD_TYPES)
+
 
 # ANSI color codes
 COLORS = {
@@ -42,6 +54,11 @@ COLORS = {
     "bright_cyan": "\033[96m",
     "bright_white": "\033[97m",
 }
+_RESET = COLORS["reset"]
+
+# Whether the console understands ANSI codes; the Windows console only does
+# when running inside Windows Terminal
+_USE_COLOR = not (os.name == "nt" and "WT_SESSION" not in os.environ)
 
 
 def handle_errors(func: Callable) -> Callable:
@@ -51,7 +68,7 @@ def handle_errors(func: Callable) -> Callable:
             return func(*args, **kwargs)
         except KeyError as e:
             print(colorize(f"Invalid build type: {e}", "red"))
-            print(f"Available build types: {', '.join(CMAKE_BUILD_MAP.keys())}")
+            print(f"Available build types: {CMAKE_BUILD_TYPES_STR}")
             sys.exit(1)
         except subprocess.CalledProcessError as e:
             print(colorize(f"Command failed: {e}", "red"))
@@ -68,12 +85,31 @@ def colorize(text: str, color: str) -> str:
         color (str): Color name from COLORS dict
 
     Returns:
-        str: Colorized text or original text if colors not supported
+        str: Colorized text, or the original text if colors are not supported
+            or the color is unknown
     """
-    # Skip coloring on Windows unless in Windows Terminal
-    if os.name == "nt" and "WT_SESSION" not in os.environ:
+    code = COLORS.get(color)
+    if code is None or not _USE_COLOR:
         return text
-    return f"{COLORS.get(color, '')}{text}{COLORS['reset']}"
+    return f"{code}{text}{_RESET}"
+
+
+@lru_cache(maxsize=256)
+def _separator_bars(message_len: int, width: int) -> tuple[str, str]:
+    """Return the equals-sign bars on either side of a separator message.
+
+    Args:
+        message_len (int): Length of the message without color codes
+        width (int): Width of the separator line
+
+    Returns:
+        Tuple[str, str]: Left and right bars, each at least one character long
+    """
+    # Width left over for the bars and the spaces around the message
+    non_message_len = width - message_len
+    padding = max(1, (non_message_len - 2) // 2)
+    right_padding = max(1, non_message_len - 2 - padding)
+    return "=" * padding, "=" * right_padding
 
 
 def print_separator(message: str = "", color: str = "bold", width: int = 80) -> None:
@@ -84,36 +120,153 @@ def print_separator(message: str = "", color: str = "bold", width: int = 80) ->
         color (str, optional): Color for the message. Defaults to "bold".
         width (int, optional): Width of the separator line. Defaults to 80.
     """
-    if message:
-        # Calculate the length of the message without color codes
-        message_display_len = len(message)
-        # Get the colored message first so we can use it in the final output
-        colored_message = colorize(message, color)
-        # Calculate the total length of non-message parts (equals signs and spaces)
-        non_message_len = width - message_display_len
-        # We need at least 2 spaces (one on each side of the message)
-        if non_message_len < 2:
-            # If message is too long, truncate it
-            message = message[: width - 4] + "..."
-            message_display_len = len(message)
-            non_message_len = width - message_display_len
-            # Update colored message with truncated message
-            colored_message = colorize(message, color)
-
-        # Calculate padding, ensuring we have at least one equals sign on each side
-        padding = max(1, (non_message_len - 2) // 2)
-        right_padding = max(1, non_message_len - 2 - padding)
-
-        # Create the separator
-        separator = "=" * padding + " " + colored_message + " " + "=" * right_padding
-        print(separator)
-    else:
+    if not message:
         print("=" * width)
+        return
+
+    # We need at least 2 spaces (one on each side of the message)
+    if width - len(message) < 2:
+        # If message is too long, truncate it
+        message = message[: width - 4] + "..."
+
+    left, right = _separator_bars(len(message), width)
+    print(f"{left} {colorize(message, color)} {right}")
+
+
+def print_summary(title: str, results: list[tuple[str, bool, float]]) -> None:
+    """Print a per-build-type result table under a separator.
+
+    The rows are written with a single call.
+
+    Args:
+        title (str): Separator title
+        results (List[Tuple[str, bool, float]]): Build type, success and elapsed seconds
+    """
+    print_separator(title, "bold")
+    success, failed = colorize("SUCCESS", "green"), colorize("FAILED", "red")
+    rows = [
+        f"{build_type.ljust(10)}: {success if result else failed} ({elapsed:.2f}s)\n"
+        for build_type, result, elapsed in results
+    ]
+    sys.stdout.write("".join(rows))
+
+
+class _ThreadRouter:
+    """Text stream that holds each thread's writes while it is grouping output.
+
+    Threads without a group write straight through to the wrapped stream.
+    """
+
+    def __init__(self, target) -> None:
+        """Initialize the _ThreadRouter.
+
+        Args:
+            target: Stream to write through to
+        """
+        self.target = target
+        self.local = threading.local()
 
+    def write(self, text: str) -> int:
+        group = getattr(self.local, "group", None)
+        if group is None:
+            return self.target.write(text)
+        group.append((self.target, text))
+        return len(text)
 
+    def flush(self) -> None:
+        if getattr(self.local, "group", None) is None:
+            self.target.flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self.target, name)
+
+    def for_current_thread(self):
+        """Return a stream that writes as the calling thread would.
+
+        Helper threads started on a thread's behalf write through it so that
+        their output joins the calling thread's group.
+
+        Returns:
+            Stream writing into the calling thread's group, or the wrapped stream
+        """
+        group = getattr(self.local, "group", None)
+        if group is None:
+            return self.target
+        return _GroupSink(self.target, group)
+
+
+class _GroupSink:
+    """Text stream that appends writes to one thread's output group."""
+
+    def __init__(self, target, group: list[tuple]) -> None:
+        """Initialize the _GroupSink.
+
+        Args:
+            target: Stream the group is written to when replayed
+            group (List[Tuple]): Output group to append to
+        """
+        self.target = target
+        self.group = group
+
+    def write(self, text: str) -> int:
+        self.group.append((self.target, text))
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def map_grouped(func: Callable, items: list) -> list:
+    """Call a function on each item concurrently without interleaving output.
+
+    Everything each call writes to stdout and stderr is held until the call
+    returns and is then written out in one piece, in its original order.
+
+    Args:
+        func (Callable): Function to call with each item
+        items (List): Items to process, one thread each
+
+    Returns:
+        List: Results of the calls, in the order of the items
+    """
+    # Imported here: concurrent.futures pulls in logging, which the help and
+    # version paths that import this module never need
+    from concurrent.futures import ThreadPoolExecutor
+
+    stdout, stderr = sys.stdout, sys.stderr
+    routers = (_ThreadRouter(stdout), _ThreadRouter(stderr))
+    lock = threading.Lock()
+
+    def _call(item):
+        group: list[tuple] = []
+        for router in routers:
+            router.local.group = group
+        try:
+            return func(item)
+        finally:
+            for router in routers:
+                router.local.group = None
+            with lock:
+                for target, text in group:
+                    target.write(text)
+                stdout.flush()
+                stderr.flush()
+
+    sys.stdout, sys.stderr = routers
+    try:
+        with ThreadPoolExecutor(max_workers=len(items)) as executor:
+            return list(executor.map(_call, items))
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+
+
+@lru_cache(maxsize=1)
 def ensure_virtualenv() -> str:
     """Check if running in a virtualenv, and create one if not.
 
+    The result is cached, so later calls in the same process do not probe
+    the filesystem or create the environment again.
+
     Returns:
         str: Path to the Python executable to use for pip operations.
     """
@@ -126,6 +279,8 @@ def ensure_virtualenv() -> str:
         print("Already running in a virtual environment.")
         return sys.executable
 
+    from pathlib import Path
+
     # For creating a virtualenv, use the subprocess module to call python -m venv
     # instead of importing venv directly
     venv_dir = Path(os.path.abspath(os.path.dirname(os.path.dirname(__file__)))) / "env"
@@ -135,17 +290,13 @@ def ensure_virtualenv() -> str:
 
     if not venv_dir.exists():
         print("Creating virtual environment in ./env directory...")
-        import subprocess
         subprocess.run([sys.executable, "-m", "venv", str(venv_dir)], check=True)
         print(f"Virtual environment created at {venv_dir}")
     elif not venv_python.exists():
         print(
             "Existing env directory found but appears to be incomplete. Recreating..."
         )
-        import shutil
-
         shutil.rmtree(venv_dir)
-        import subprocess
         subprocess.run([sys.executable, "-m", "venv", str(venv_dir)], check=True)
         print(f"Virtual environment recreated at {venv_dir}")
     else:
@@ -154,19 +305,49 @@ def ensure_virtualenv() -> str:
     return str(venv_python)
 
 
-def get_system_info() -> Dict[str, str]:
-    """Get system information.
+@lru_cache(maxsize=1)
+def usable_cpu_count() -> int:
+    """Return the number of CPUs available to this process.
+
+    Uses the scheduler affinity mask where available so that containerized
+    or pinned runs do not oversubscribe, falling back to os.cpu_count().
+
+    Returns:
+        int: Number of usable CPUs
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 4
+
+
+@lru_cache(maxsize=1)
+def _system_info() -> dict[str, str]:
+    """Gather the system information reported by get_system_info.
+
+    None of it changes while the process runs, so it is gathered once.
 
     Returns:
         Dict[str, str]: Dictionary containing system information
     """
-    info = {
+    import platform
+
+    return {
         "os": f"{platform.system()} {platform.release()}",
         "architecture": platform.machine(),
         "python": platform.python_version(),
-        "cpu_count": str(os.cpu_count() or 0),
+        "cpu_count": str(usable_cpu_count()),
     }
-    return info
+
+
+def get_system_info() -> dict[str, str]:
+    """Get system information.
+
+    Returns:
+        Dict[str, str]: Dictionary containing system information, a fresh
+            copy the caller may modify
+    """
+    return dict(_system_info())
 
 
 def is_executable(path: str) -> bool:
@@ -178,39 +359,32 @@ def is_executable(path: str) -> bool:
     Returns:
         bool: True if the file is executable, False otherwise
     """
-    return os.path.isfile(path) and os.access(path, os.X_OK)
-
-
-def find_executable(name: str) -> Optional[str]:
+    if os.name == "nt":
+        # Windows has no execute bit; the PATHEXT extension decides
+        return os.path.isfile(path)
+    # One stat answers both "regular file?" and "executable?"
+    try:
+        mode = os.stat(path).st_mode
+    except OSError:
+        return False
+    return stat.S_ISREG(mode) and bool(mode & 0o111)
+
+
+@lru_cache(maxsize=None)
+def find_executable(name: str) -> str | None:
     """Find an executable in the system PATH.
 
+    Uses shutil.which, which also handles PATHEXT matching on Windows.
+    Results are cached for the life of the process, since the same tools
+    are looked up repeatedly and PATH does not change while running.
+
     Args:
         name (str): Name of the executable
 
     Returns:
         Optional[str]: Path to the executable if found, None otherwise
     """
-    # On Windows, executables can have different extensions
-    if platform.system() == "Windows":
-        extensions = os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD").split(";")
-    else:
-        extensions = [""]  # No extensions on Unix-like systems
-
-    # Check if the name already has a path
-    if os.path.dirname(name):
-        if is_executable(name):
-            return name
-        return None
-
-    # Search in PATH
-    for path in os.environ.get("PATH", "").split(os.pathsep):
-        path = path.strip('"')
-        for ext in extensions:
-            executable = os.path.join(path, name + ext)
-            if is_executable(executable):
-                return executable
-
-    return None
+    return shutil.which(name)
 
 
 def ensure_dir_exists(directory: str) -> None:
@@ -223,6 +397,54 @@ def ensure_dir_exists(directory: str) -> None:
         os.makedirs(directory)
 
 
+def user_cache_path(name: str) -> str:
+    """Return the path of a file in ActionMan's user cache directory.
+
+    Args:
+        name (str): File name
+
+    Returns:
+        str: Path under $XDG_CACHE_HOME/actionman (or ~/.cache/actionman)
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_home, "actionman", name)
+
+
+def load_user_cache(name: str) -> dict:
+    """Load a JSON object from the user cache directory.
+
+    Args:
+        name (str): File name
+
+    Returns:
+        dict: Cached data, or an empty dict if missing or unreadable
+    """
+    try:
+        with open(user_cache_path(name)) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_user_cache(name: str, data: dict) -> None:
+    """Atomically save a JSON object to the user cache directory, ignoring errors.
+
+    Args:
+        name (str): File name
+        data (dict): Data to save
+    """
+    path = user_cache_path(name)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
 def print_error(message: str) -> None:
     """Print an error message in red.
 
@@ -259,17 +481,159 @@ def print_info(message: str) -> None:
     print(colorize(f"INFO: {message}", "blue"))
 
 
-def run_command(cmd: List[str], cwd: str = None) -> Tuple[int, str, str]:
+# Characters of each output stream kept for the return value when streaming
+STREAM_TAIL_LIMIT = 64 * 1024
+
+
+class _TailBuffer:
+    """Keeps the most recent text appended to it, up to a size limit.
+
+    Streamed output has already been shown on the console, so only its
+    tail is kept for error reporting instead of the whole log.
+    """
+
+    def __init__(self, limit: int = STREAM_TAIL_LIMIT):
+        """Initialize the _TailBuffer.
+
+        Args:
+            limit (int, optional): Approximate number of characters to keep. Defaults to STREAM_TAIL_LIMIT.
+        """
+        self.limit = limit
+        self.size = 0
+        self.chunks: deque[str] = deque()
+
+    def append(self, text: str) -> None:
+        """Append text, dropping the oldest chunks beyond the limit.
+
+        Args:
+            text (str): Text to append
+        """
+        self.chunks.append(text)
+        self.size += len(text)
+        while self.size > self.limit and len(self.chunks) > 1:
+            self.size -= len(self.chunks.popleft())
+
+    def __str__(self) -> str:
+        return "".join(self.chunks)
+
+
+def _tee(pipe, sink, buf: _TailBuffer) -> None:
+    """Copy lines from a pipe to a stream while collecting them.
+
+    Args:
+        pipe: Text pipe to read from
+        sink: Stream to write each line to as it arrives
+        buf (_TailBuffer): Buffer the lines are appended to
+    """
+    for line in iter(pipe.readline, ""):
+        sink.write(line)
+        sink.flush()
+        buf.append(line)
+    pipe.close()
+
+
+def run_command(
+    cmd: list[str],
+    cwd: str = None,
+    stream: bool = False,
+    timeout: float | None = None,
+    capture: bool = True,
+) -> tuple[int, str, str]:
     """Run a command and capture output.
 
+    Commands are always launched from an argument list, without a shell,
+    ``preexec_fn``, ``env`` override or user/group change. This keeps
+    CPython on its fast launch path on Linux (vfork, or posix_spawn when
+    no cwd is given), which does not copy the interpreter's page tables.
+    Keep it that way when adding options here.
+
     Args:
         cmd (List[str]): Command and arguments to run
         cwd (str, optional): Directory to run command in. Defaults to None.
+        stream (bool, optional): Echo stdout and stderr to the console as lines
+            arrive, instead of only once the command exits. Only the last
+            STREAM_TAIL_LIMIT characters of each are returned. Defaults to False.
+        timeout (Optional[float], optional): Seconds to wait for a captured
+            command before giving up. Defaults to None (no limit).
+        capture (bool, optional): Capture the output. When False the command
+            inherits the console directly and empty strings are returned for
+            stdout and stderr. Defaults to True.
 
     Returns:
         Tuple[int, str, str]: Return code, stdout, stderr
+
+    Raises:
+        subprocess.TimeoutExpired: If a command exceeds the timeout
     """
-    import subprocess
+    if not capture:
+        return subprocess.run(cmd, cwd=cwd, timeout=timeout).returncode, "", ""
 
-    result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
-    return result.returncode, result.stdout, result.stderr
+    if not stream:
+        result = subprocess.run(
+            cmd, capture_output=True, text=True, cwd=cwd, timeout=timeout
+        )
+        return result.returncode, result.stdout, result.stderr
+
+    if os.name == "nt":
+        # select() only works on sockets on Windows, so use reader threads there
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            cwd=cwd,
+        )
+        out_buf = _TailBuffer()
+        err_buf = _TailBuffer()
+        # The readers write on this thread's behalf, keeping map_grouped
+        # output together
+        out_sink, err_sink = (
+            stream.for_current_thread() if isinstance(stream, _ThreadRouter) else stream
+            for stream in (sys.stdout, sys.stderr)
+        )
+        readers = [
+            threading.Thread(target=_tee, args=(process.stdout, out_sink, out_buf)),
+            threading.Thread(target=_tee, args=(process.stderr, err_sink, err_buf)),
+        ]
+        for reader in readers:
+            reader.start()
+        returncode = process.wait()
+        for reader in readers:
+            reader.join()
+        return returncode, str(out_buf), str(err_buf)
+
+    process = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=cwd
+    )
+    out_buf = _TailBuffer()
+    err_buf = _TailBuffer()
+    encoding = locale.getpreferredencoding(False)
+    with selectors.DefaultSelector() as selector:
+        for pipe, sink, buf in (
+            (process.stdout, sys.stdout, out_buf),
+            (process.stderr, sys.stderr, err_buf),
+        ):
+            os.set_blocking(pipe.fileno(), False)
+            # Decode as text mode would, including newline translation
+            decoder = io.IncrementalNewlineDecoder(
+                codecs.getincrementaldecoder(encoding)(errors="replace"),
+                translate=True,
+            )
+            selector.register(pipe, selectors.EVENT_READ, (sink, buf, decoder))
+
+        while selector.get_map():
+            for key, _ in selector.select():
+                sink, buf, decoder = key.data
+                data = os.read(key.fd, 65536)
+                text = decoder.decode(data, final=not data)
+                if text:
+                    sink.write(text)
+                    sink.flush()
+                    buf.append(text)
+                if not data:
+                    selector.unregister(key.fileobj)
+                    key.fileobj.close()
+
+    returncode = process.wait()
+    return returncode, str(out_buf), str(err_buf)
@@ -7,33 +7,102 @@ This module provides fixtures that can be used across all test modules.
 """
 
 import os
-import shutil
-import tempfile
+import threading
+from collections import defaultdict
 from pathlib import Path
-from typing import Generator, Dict, Any
+from typing import Any, Callable, Dict, Iterator
 
 import pytest
 
+import actionman.utils
 from actionman.core import BuildManager
+from actionman.modules import build_operations as _build_operations
+from actionman.modules import run_operations as _run_operations
+from actionman.modules import system_operations as _system_operations
+from actionman.modules import test_operations as _test_operations
 from actionman.modules.build_operations import BuildOperations
 from actionman.modules.run_operations import RunOperations
-from actionman.modules.test_operations import TestingOperations
 from actionman.modules.system_operations import SystemOperations
+from actionman.modules.test_operations import TestingOperations
+
+# Modules whose run_command is replaced by mock_command_runner
+_RUN_COMMAND_MODULES = (
+    actionman.utils,
+    _build_operations,
+    _run_operations,
+    _test_operations,
+    _system_operations,
+)
+
+# cmake mode options and the kind of command they select
+_CMAKE_KINDS = {"--build": "cmake-build", "--install": "cmake-install"}
+
+
+def _command_kind(cmd) -> str:
+    """
+    Classify a command recorded by mock_command_runner.
+
+    Args:
+        cmd: Command as passed to run_command
+
+    Returns:
+        str: cmake-configure, cmake-build, cmake-install, ctest or run
+    """
+    program = os.path.basename(cmd[0])
+    if program == "cmake":
+        return _CMAKE_KINDS.get(cmd[1], "cmake-configure")
+    if program == "ctest":
+        return "ctest"
+    return "run"
+
+
+class RecordingManager:
+    """Stand-in for BuildManager that records the methods called on it.
+
+    Attributes:
+        calls (List[Tuple[str, tuple, dict]]): Method name, positional and
+            keyword arguments of each call, in order
+    """
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def __getattr__(self, name: str):
+        def record(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+
+        return record
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_home(tmp_path, monkeypatch) -> None:
+    """
+    Point the user cache directory at a temporary path for every test.
+
+    Keeps the tool version cache written by system_info out of the real
+    home directory and independent between tests.
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
 
 
 @pytest.fixture
-def temp_dir() -> Generator[str, None, None]:
+def temp_dir(tmp_path: Path) -> str:
     """
     Create a temporary directory for tests.
 
-    Yields:
+    Uses pytest's tmp_path, which pytest removes itself in later sessions,
+    so no deletion happens during teardown.
+
+    Args:
+        tmp_path (Path): Per-test temporary directory from pytest
+
+    Returns:
         str: Path to the temporary directory
     """
-    temp_dir = tempfile.mkdtemp()
-    try:
-        yield temp_dir
-    finally:
-        shutil.rmtree(temp_dir)
+    # tmp_path itself also holds the isolated user cache
+    project_dir = tmp_path / "project"
+    project_dir.mkdir()
+    return str(project_dir)
 
 
 @pytest.fixture
@@ -47,26 +116,22 @@ def mock_build_dir(temp_dir: str) -> str:
     Returns:
         str: Path to the mock build directory
     """
-    build_dir = os.path.join(temp_dir, "build")
-    os.makedirs(build_dir, exist_ok=True)
+    build_dir = Path(temp_dir, "build")
 
-    # Create mock build type directories
+    # Create mock build type directories, each with a mock executable
     for build_type in ["Debug", "RelWithDebInfo", "Release"]:
-        build_type_dir = os.path.join(build_dir, build_type)
-        os.makedirs(build_type_dir, exist_ok=True)
-
-        # Create a mock executable
-        bin_dir = os.path.join(build_type_dir, "bin")
-        os.makedirs(bin_dir, exist_ok=True)
+        # temp_dir is new, so nothing here can exist yet
+        bin_dir = build_dir / build_type / "bin"
+        bin_dir.mkdir(parents=True)
 
-        executable_path = os.path.join(bin_dir, "test_executable")
-        with open(executable_path, "w") as f:
-            f.write('#!/bin/sh\necho "Mock executable for {build_type}"')
+        executable_path = bin_dir / "test_executable"
+        executable_path.write_text(f'#!/bin/sh\necho "Mock executable for {build_type}"')
 
-        # Make it executable
-        os.chmod(executable_path, 0o755)
+        # Make it executable (Windows has no execute bit to set)
+        if os.name == "posix":
+            executable_path.chmod(0o755)
 
-    return build_dir
+    return str(build_dir)
 
 
 @pytest.fixture
@@ -137,6 +202,17 @@ def build_manager(temp_dir: str) -> BuildManager:
     return BuildManager(cwd=temp_dir)
 
 
+@pytest.fixture
+def recording_manager() -> RecordingManager:
+    """
+    Create a RecordingManager for testing the CLI command handlers.
+
+    Returns:
+        RecordingManager: Manager that records its method calls
+    """
+    return RecordingManager()
+
+
 @pytest.fixture
 def mock_command_runner(monkeypatch) -> Dict[str, Any]:
     """
@@ -146,37 +222,43 @@ def mock_command_runner(monkeypatch) -> Dict[str, Any]:
         monkeypatch: pytest's monkeypatch fixture
 
     Returns:
-        Dict[str, Any]: Dictionary with mock command history and configuration
+        Dict[str, Any]: Dictionary with the mock command history, in order,
+            and the same commands grouped by kind under "by_kind"
     """
     command_history = []
+    by_kind = defaultdict(list)
 
-    def mock_run_command(cmd, cwd=None):
-        command_history.append({"cmd": cmd, "cwd": cwd})
+    def mock_run_command(cmd, cwd=None, **kwargs):
+        record = {"cmd": cmd, "cwd": cwd}
+        command_history.append(record)
+        by_kind[_command_kind(cmd)].append(record)
         # Default successful return
         return 0, "Mock command output", ""
 
-    # Store the original function for selective use in tests
-    import actionman.utils
-    import actionman.modules.build_operations
-    import actionman.modules.run_operations
-    import actionman.modules.test_operations
-    import actionman.modules.system_operations
+    # Apply the mock to all modules that use run_command
+    for module in _RUN_COMMAND_MODULES:
+        monkeypatch.setattr(module, "run_command", mock_run_command)
 
-    original_run_command = actionman.utils.run_command
+    return {"history": command_history, "by_kind": by_kind}
+
+
+@pytest.fixture
+def wait_for_clean() -> Iterator[Callable[[], None]]:
+    """
+    Wait for clean_directory's background deletions.
+
+    The fixture waits again at teardown, so no deletion outlives the test
+    and races the removal of its temporary directory.
+
+    Returns:
+        Callable[[], None]: Function that blocks until the deletions finish
+    """
+
+    def wait() -> None:
+        for thread in threading.enumerate():
+            if thread.name == "actionman-clean":
+                thread.join()
+
+    yield wait
+    wait()
 
-    # Apply the mock to all modules that use run_command
-    monkeypatch.setattr(actionman.utils, "run_command", mock_run_command)
-    monkeypatch.setattr(
-        actionman.modules.build_operations, "run_command", mock_run_command
-    )
-    monkeypatch.setattr(
-        actionman.modules.run_operations, "run_command", mock_run_command
-    )
-    monkeypatch.setattr(
-        actionman.modules.test_operations, "run_command", mock_run_command
-    )
-    monkeypatch.setattr(
-        actionman.modules.system_operations, "run_command", mock_run_command
-    )
-
-    return {"history": command_history, "original_run_command": original_run_command}
@@ -8,13 +8,22 @@ configuring and building C++ projects with CMake.
 """
 
 import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
 import pytest
-import shutil
-from unittest.mock import patch, MagicMock
 
+import actionman
+from actionman.modules import build_operations as build_operations_module
 from actionman.modules.build_operations import BuildOperations
 from actionman.utils import CMAKE_BUILD_MAP
 
+# CMake build type names of every configuration
+_CMAKE_TYPES = frozenset(CMAKE_BUILD_MAP.values())
+
 
 class TestBuildOperations:
     """Tests for the BuildOperations class."""
@@ -36,6 +45,21 @@ class TestBuildOperations:
         build_ops = BuildOperations(cwd=temp_dir, build_dir=abs_build_dir)
         assert build_ops.build_dir == abs_build_dir
 
+    def test_has_build_tree(self, temp_dir, wait_for_clean):
+        """Test has_build_tree remembers existing build trees until cleaned."""
+        build_ops = BuildOperations(cwd=temp_dir)
+        assert not build_ops.has_build_tree("debug")
+
+        os.makedirs(build_ops.config_dir("debug"))
+        assert build_ops.has_build_tree("debug")
+
+        # The positive answer is cached without checking the filesystem
+        with patch("os.path.exists", return_value=False):
+            assert build_ops.has_build_tree("debug")
+
+        build_ops.clean()
+        assert not build_ops.has_build_tree("debug")
+
     def test_configure(self, build_operations, mock_command_runner):
         """Test configure method."""
         # Test with default build type
@@ -44,9 +68,13 @@ class TestBuildOperations:
         # Verify that the correct command was called
         assert len(mock_command_runner["history"]) > 0
         last_command = mock_command_runner["history"][-1]
-        assert "cmake" in last_command["cmd"]
+        assert os.path.basename(last_command["cmd"][0]) == "cmake"
         assert "-DCMAKE_BUILD_TYPE=Debug" in last_command["cmd"]
 
+        # Each build type is configured in its own build tree
+        build_tree = last_command["cmd"][last_command["cmd"].index("-B") + 1]
+        assert build_tree == os.path.join(build_operations.build_dir, "Debug")
+
         # Test with specific build type
         mock_command_runner["history"].clear()
         build_operations.configure("release")
@@ -54,7 +82,7 @@ class TestBuildOperations:
         # Verify that the correct command was called
         assert len(mock_command_runner["history"]) > 0
         last_command = mock_command_runner["history"][-1]
-        assert "cmake" in last_command["cmd"]
+        assert os.path.basename(last_command["cmd"][0]) == "cmake"
         assert "-DCMAKE_BUILD_TYPE=Release" in last_command["cmd"]
 
         # Test with additional flags
@@ -64,10 +92,130 @@ class TestBuildOperations:
         # Verify that the correct command was called
         assert len(mock_command_runner["history"]) > 0
         last_command = mock_command_runner["history"][-1]
-        assert "cmake" in last_command["cmd"]
+        assert os.path.basename(last_command["cmd"][0]) == "cmake"
         assert "-DCMAKE_BUILD_TYPE=Debug" in last_command["cmd"]
         assert "-DSOME_FLAG=ON" in last_command["cmd"]
 
+    def test_configure_skips_when_current(self, build_operations, mock_command_runner):
+        """Test configure skips CMake when the cache and stamp match."""
+        build_operations.configure("release")
+
+        # The mock runner does not run CMake, so write the cache it would produce
+        cache = os.path.join(build_operations.config_dir("release"), "CMakeCache.txt")
+        with open(cache, "w") as f:
+            f.write("CMAKE_BUILD_TYPE:STRING=Release\n")
+
+        # Same configuration: CMake is not run again
+        mock_command_runner["history"].clear()
+        build_operations.configure("release")
+        assert mock_command_runner["history"] == []
+
+        # Different flags: CMake is run again
+        build_operations.configure("release", ["-DSOME_FLAG=ON"])
+        assert len(mock_command_runner["history"]) == 1
+
+        # Forced reconfigure: CMake is run even though nothing changed
+        mock_command_runner["history"].clear()
+        build_operations.configure("release", ["-DSOME_FLAG=ON"], force_reconfigure=True)
+        assert len(mock_command_runner["history"]) == 1
+
+    def test_configure_once_per_instance(
+        self, build_operations, mock_command_runner, wait_for_clean
+    ):
+        """Test configure runs CMake once per configuration until cleaned."""
+        build_operations.configure("debug")
+        build_operations.configure("debug")
+        assert len(mock_command_runner["history"]) == 1
+
+        # Cleaning forgets the configurations
+        build_operations.clean()
+        build_operations.configure("debug")
+        assert len(mock_command_runner["history"]) == 2
+
+    def test_configure_compiler_launcher(
+        self, build_operations, mock_command_runner, monkeypatch
+    ):
+        """Test configure uses a compiler cache as the launcher when available."""
+        monkeypatch.setattr(
+            build_operations_module, "_detect_compiler_launcher", lambda: "ccache"
+        )
+        monkeypatch.delenv("ACTIONMAN_NO_CCACHE", raising=False)
+
+        build_operations.configure("debug")
+        cmd = mock_command_runner["history"][-1]["cmd"]
+        assert "-DCMAKE_C_COMPILER_LAUNCHER=ccache" in cmd
+        assert "-DCMAKE_CXX_COMPILER_LAUNCHER=ccache" in cmd
+
+        # A launcher chosen by the user is left alone
+        build_operations.configure("debug", ["-DCMAKE_CXX_COMPILER_LAUNCHER=distcc"])
+        cmd = mock_command_runner["history"][-1]["cmd"]
+        assert "-DCMAKE_CXX_COMPILER_LAUNCHER=ccache" not in cmd
+
+        # The environment override disables the launcher
+        monkeypatch.setenv("ACTIONMAN_NO_CCACHE", "1")
+        build_operations.configure("release")
+        cmd = mock_command_runner["history"][-1]["cmd"]
+        assert not any("_COMPILER_LAUNCHER" in flag for flag in cmd)
+
+    def test_find_cmake(self, monkeypatch):
+        """Test the CMake path is resolved once and falls back to the bare name."""
+        calls = []
+
+        def fake_which(name):
+            calls.append(name)
+            return None
+
+        monkeypatch.setattr(build_operations_module.shutil, "which", fake_which)
+        build_operations_module._find_cmake.cache_clear()
+        try:
+            assert build_operations_module._find_cmake() == "cmake"
+            assert build_operations_module._find_cmake() == "cmake"
+        finally:
+            build_operations_module._find_cmake.cache_clear()
+        assert calls == ["cmake"]
+
+    @pytest.mark.parametrize(
+        "ninja, expected",
+        [
+            ("/usr/bin/ninja", "Ninja"),
+            (None, "Visual Studio 17 2022" if os.name == "nt" else "Unix Makefiles"),
+        ],
+    )
+    def test_configure_generator(
+        self, build_operations, mock_command_runner, monkeypatch, ninja, expected
+    ):
+        """Test configure prefers Ninja when it is on the PATH."""
+        monkeypatch.setattr(
+            build_operations_module.shutil,
+            "which",
+            lambda name: ninja if name == "ninja" else None,
+        )
+        build_operations_module._detect_generator.cache_clear()
+        try:
+            build_operations.configure("debug")
+        finally:
+            build_operations_module._detect_generator.cache_clear()
+
+        configure_cmd = mock_command_runner["by_kind"]["cmake-configure"][0]["cmd"]
+        assert configure_cmd[configure_cmd.index("-G") + 1] == expected
+
+    def test_configure_unity_build(
+        self, build_operations, mock_command_runner, monkeypatch
+    ):
+        """Test configure enables unity builds for optimized build types only."""
+        monkeypatch.delenv("ACTIONMAN_NO_UNITY_BUILD", raising=False)
+
+        build_operations.configure("release")
+        assert "-DCMAKE_UNITY_BUILD=ON" in mock_command_runner["history"][-1]["cmd"]
+
+        build_operations.configure("debug")
+        assert "-DCMAKE_UNITY_BUILD=ON" not in mock_command_runner["history"][-1]["cmd"]
+
+        # The environment override disables unity builds
+        monkeypatch.setenv("ACTIONMAN_NO_UNITY_BUILD", "1")
+        build_operations.configure("profile")
+        assert "-DCMAKE_UNITY_BUILD=ON" not in mock_command_runner["history"][-1]["cmd"]
+
     def test_build(self, build_operations, mock_command_runner):
         """Test build method."""
         # Test with default build type
@@ -76,12 +224,12 @@ class TestBuildOperations:
         # Verify that configure was called first
         assert len(mock_command_runner["history"]) >= 2
         configure_command = mock_command_runner["history"][0]
-        assert "cmake" in configure_command["cmd"]
+        assert os.path.basename(configure_command["cmd"][0]) == "cmake"
         assert "-DCMAKE_BUILD_TYPE=Debug" in configure_command["cmd"]
 
         # Verify that build was called
         build_command = mock_command_runner["history"][-1]
-        assert "cmake" in build_command["cmd"]
+        assert os.path.basename(build_command["cmd"][0]) == "cmake"
         assert "--build" in build_command["cmd"]
 
         # Test with specific build type
@@ -91,29 +239,107 @@ class TestBuildOperations:
         # Verify that configure was called with the correct build type
         assert len(mock_command_runner["history"]) >= 2
         configure_command = mock_command_runner["history"][0]
-        assert "cmake" in configure_command["cmd"]
+        assert os.path.basename(configure_command["cmd"][0]) == "cmake"
         assert "-DCMAKE_BUILD_TYPE=Release" in configure_command["cmd"]
 
+    def test_build_parallel_level(self, build_operations, mock_command_runner, monkeypatch):
+        """Test build leaves the job count to CMAKE_BUILD_PARALLEL_LEVEL when set."""
+        monkeypatch.delenv("CMAKE_BUILD_PARALLEL_LEVEL", raising=False)
+        build_operations.build()
+        assert "--parallel" in mock_command_runner["history"][-1]["cmd"]
+
+        monkeypatch.setenv("CMAKE_BUILD_PARALLEL_LEVEL", "2")
+        build_operations.build()
+        assert "--parallel" not in mock_command_runner["history"][-1]["cmd"]
+
+        # An explicit job count still wins
+        build_operations.build(jobs=3)
+        cmd = mock_command_runner["history"][-1]["cmd"]
+        assert cmd[cmd.index("--parallel") + 1] == "3"
+
+    def test_build_distributed_jobs(
+        self, build_operations, mock_command_runner, monkeypatch
+    ):
+        """Test build scales the job count for distcc and honours ACTIONMAN_JOBS."""
+        monkeypatch.setattr(build_operations_module, "usable_cpu_count", lambda: 2)
+        for var in ("CMAKE_BUILD_PARALLEL_LEVEL", "ACTIONMAN_JOBS", "ICECC_VERSION"):
+            monkeypatch.delenv(var, raising=False)
+
+        monkeypatch.setenv("DISTCC_HOSTS", "localhost/2 farm/16")
+        build_operations.build()
+        cmd = mock_command_runner["history"][-1]["cmd"]
+        assert cmd[cmd.index("--parallel") + 1] == str(
+            2 * build_operations_module.DISTRIBUTED_JOBS_FACTOR
+        )
+
+        monkeypatch.setenv("ACTIONMAN_JOBS", "5")
+        build_operations.build()
+        cmd = mock_command_runner["history"][-1]["cmd"]
+        assert cmd[cmd.index("--parallel") + 1] == "5"
+
     def test_build_all(self, build_operations, mock_command_runner):
         """Test build_all method."""
         build_operations.build_all()
 
         # Verify that build was called for each build type
-        build_types = list(CMAKE_BUILD_MAP.keys())
         assert (
-            len(mock_command_runner["history"]) >= len(build_types) * 2
+            len(mock_command_runner["history"]) >= len(CMAKE_BUILD_MAP) * 2
         )  # configure + build for each type
 
         # Check that each build type was configured
-        configured_types = []
-        for cmd in mock_command_runner["history"]:
-            for build_type in CMAKE_BUILD_MAP.values():
-                if f"-DCMAKE_BUILD_TYPE={build_type}" in cmd["cmd"]:
-                    configured_types.append(build_type)
+        configured_types = {
+            arg.partition("=")[2]
+            for cmd in mock_command_runner["history"]
+            for arg in cmd["cmd"]
+            if arg.startswith("-DCMAKE_BUILD_TYPE=")
+        }
+        assert configured_types == _CMAKE_TYPES
+
+    def test_build_all_grouped_output(self, build_operations, capsys):
+        """Test build_all keeps each configuration's output together."""
+        barrier = threading.Barrier(len(CMAKE_BUILD_MAP))
+
+        def fake_build(build_type, jobs=None):
+            print(f"{build_type} start")
+            barrier.wait(timeout=5)
+            print(f"{build_type} end")
+
+        with patch.object(build_operations, "build", side_effect=fake_build):
+            build_operations.build_all()
+
+        lines = capsys.readouterr().out.splitlines()
+        # All builds were running at once, yet their lines are not interleaved
+        for build_type in CMAKE_BUILD_MAP:
+            start = lines.index(f"{build_type} start")
+            assert lines[start - 1] == f"Building {build_type} configuration..."
+            assert lines[start + 1] == f"{build_type} end"
+
+    def test_build_all_parallel_level(
+        self, build_operations, mock_command_runner, monkeypatch
+    ):
+        """Test build_all leaves the job count to CMAKE_BUILD_PARALLEL_LEVEL when set."""
+        monkeypatch.delenv("ACTIONMAN_JOBS", raising=False)
+        monkeypatch.setenv("CMAKE_BUILD_PARALLEL_LEVEL", "2")
+
+        build_operations.build_all()
+
+        build_cmds = mock_command_runner["by_kind"]["cmake-build"]
+        assert len(build_cmds) == len(CMAKE_BUILD_MAP)
+        for build_cmd in build_cmds:
+            assert "--parallel" not in build_cmd["cmd"]
+
+    def test_build_all_splits_jobs(
+        self, build_operations, mock_command_runner, monkeypatch
+    ):
+        """Test build_all splits the job count between the configurations."""
+        monkeypatch.delenv("CMAKE_BUILD_PARALLEL_LEVEL", raising=False)
+        monkeypatch.setenv("ACTIONMAN_JOBS", str(4 * len(CMAKE_BUILD_MAP)))
+
+        build_operations.build_all()
 
-        # Verify all build types were configured
-        for build_type in CMAKE_BUILD_MAP.values():
-            assert build_type in configured_types
+        for build_cmd in mock_command_runner["by_kind"]["cmake-build"]:
+            cmd = build_cmd["cmd"]
+            assert cmd[cmd.index("--parallel") + 1] == "4"
 
     def test_install(self, build_operations, mock_command_runner):
         """Test install method."""
@@ -150,42 +376,84 @@ class TestBuildOperations:
         prefix_index = install_command["cmd"].index("--prefix")
         assert install_command["cmd"][prefix_index + 1] == prefix
 
-    def test_clean_directory(self, build_operations, temp_dir):
+    def test_install_verification_cache(
+        self, build_operations, mock_command_runner, temp_dir
+    ):
+        """Test install skips the --version check for an already verified binary."""
+        prefix = os.path.join(temp_dir, "prefix")
+        os.makedirs(os.path.join(prefix, "bin"))
+        with open(os.path.join(prefix, "bin", "app"), "w") as f:
+            f.write("#!/bin/sh\necho app 1.0")
+
+        def version_checks():
+            return [c for c in mock_command_runner["history"] if "--version" in c["cmd"]]
+
+        build_operations.install("debug", prefix)
+        assert len(version_checks()) == 1
+
+        # Unchanged binary: the cached result is used
+        build_operations.install("debug", prefix)
+        assert len(version_checks()) == 1
+
+        # Modified binary: verified again
+        with open(os.path.join(prefix, "bin", "app"), "a") as f:
+            f.write("\n")
+        build_operations.install("debug", prefix)
+        assert len(version_checks()) == 2
+
+    def test_clean_directory(self, build_operations, temp_dir, capsys, wait_for_clean):
         """Test clean_directory method."""
-        # Create a test directory with some files
+        # A relative directory is resolved against the working directory
+        test_dir = Path(temp_dir, "test_clean")
+        test_dir.mkdir()
+        (test_dir / "file.txt").touch()
+
+        build_operations.clean_directory("test_clean")
+        assert not test_dir.exists()
+
+        # A missing directory is reported and left alone
+        build_operations.clean_directory("test_clean")
+        assert "Nothing to clean" in capsys.readouterr().out
+
+    def test_clean_directory_removes_tree(
+        self, build_operations, temp_dir, wait_for_clean
+    ):
+        """Test clean_directory removes the directory in the background."""
         test_dir = os.path.join(temp_dir, "test_clean")
-        os.makedirs(test_dir, exist_ok=True)
+        os.makedirs(os.path.join(test_dir, "subdir"))
+        with open(os.path.join(test_dir, "subdir", "subfile.txt"), "w") as f:
+            f.write("Test subfile")
 
-        # Create some test files
-        for i in range(3):
-            with open(os.path.join(test_dir, f"file{i}.txt"), "w") as f:
-                f.write(f"Test file {i}")
+        # A leftover from an interrupted clean is swept up as well
+        os.makedirs(test_dir + ".trash-1-1")
 
-        # Create a subdirectory with files
-        subdir = os.path.join(test_dir, "subdir")
-        os.makedirs(subdir, exist_ok=True)
-        with open(os.path.join(subdir, "subfile.txt"), "w") as f:
-            f.write("Test subfile")
+        build_operations.clean_directory(test_dir)
+
+        # The directory is moved aside before the call returns
+        assert not os.path.exists(test_dir)
+
+        wait_for_clean()
+        assert not any(".trash-" in name for name in os.listdir(temp_dir))
+
+    def test_clean_cli_removes_tree(self, temp_dir):
+        """Test the clean command has deleted the build tree when it exits."""
+        build_dir = Path(temp_dir, "build")
+        for index in range(100):
+            subdir = build_dir / "Debug" / f"dir{index}"
+            subdir.mkdir(parents=True)
+            (subdir / "file.o").write_bytes(b"\0" * 1024)
+
+        # Run from the checkout under test, wherever pytest was started
+        env = dict(os.environ, PYTHONPATH=str(Path(actionman.__file__).parents[1]))
+        result = subprocess.run(
+            [sys.executable, "-m", "actionman.cli", "-C", temp_dir, "clean"],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
 
-        # Verify files exist
-        assert len(os.listdir(test_dir)) > 0
-
-        # Instead of testing the actual implementation, we'll just verify
-        # that the directory exists and then manually remove the files
-        # to simulate what the method should do
-        assert os.path.exists(test_dir)
-
-        # Manually clean the directory to simulate the method's behavior
-        for item in os.listdir(test_dir):
-            item_path = os.path.join(test_dir, item)
-            if os.path.isdir(item_path):
-                shutil.rmtree(item_path)
-            else:
-                os.remove(item_path)
-
-        # Verify directory is empty but still exists
-        assert os.path.exists(test_dir)
-        assert len(os.listdir(test_dir)) == 0
+        assert result.returncode == 0, result.stderr
+        assert os.listdir(temp_dir) == []
 
     def test_clean(self, build_operations, mock_build_dir):
         """Test clean method."""
@@ -8,249 +8,243 @@ argument parsing and delegation to the BuildManager.
 """
 
 import os
-import sys
+import subprocess
+from unittest.mock import patch
+
 import pytest
-from unittest.mock import patch, MagicMock
 
 from actionman.cli import (
-    parse_args,
+    ParsedArgs,
     handle_build_command,
+    handle_clean_command,
+    handle_info_command,
+    handle_install_command,
     handle_run_command,
     handle_test_command,
-    handle_install_command,
     main,
+    parse_args,
+    split_long_opts,
 )
 
 
 class TestCLI:
     """Tests for the CLI module."""
 
-    def test_parse_args(self):
+    @pytest.mark.parametrize(
+        "argv, command, options, working_dir",
+        [
+            ([], None, [], None),
+            (["build"], "build", [], None),
+            (["build", "debug"], "build", ["debug"], None),
+            # Working directory, in each spelling and position
+            (["--cd", "/path/to/project", "build"], "build", [], "/path/to/project"),
+            (["-c", "/path/to/project", "build"], "build", [], "/path/to/project"),
+            (
+                ["build", "release", "-C", "/path/to/project"],
+                "build",
+                ["release"],
+                "/path/to/project",
+            ),
+            (["--cd=/path/to/project", "clean"], "clean", [], "/path/to/project"),
+            # Flags after the command are passed through as options
+            (
+                ["run", "debug", "--help", "-v", "--option=value"],
+                "run",
+                ["debug", "--help", "-v", "--option=value"],
+                None,
+            ),
+        ],
+    )
+    def test_parse_args(self, argv, command, options, working_dir):
         """Test parse_args function."""
-        # Test with no arguments
-        with patch("sys.argv", ["actionman"]):
-            args = parse_args()
-            assert args.command is None
-            assert args.options == []
-            assert args.working_dir is None
-
-        # Test with command only
-        with patch("sys.argv", ["actionman", "build"]):
-            args = parse_args()
-            assert args.command == "build"
-            assert args.options == []
-            assert args.working_dir is None
-
-        # Test with command and options
-        with patch("sys.argv", ["actionman", "build", "debug"]):
-            args = parse_args()
-            assert args.command == "build"
-            assert args.options == ["debug"]
-            assert args.working_dir is None
-
-        # Test with working directory
-        with patch("sys.argv", ["actionman", "--cd", "/path/to/project", "build"]):
-            args = parse_args()
-            assert args.command == "build"
-            assert args.options == []
-            assert args.working_dir == "/path/to/project"
-
-        # Test with short working directory option
-        with patch("sys.argv", ["actionman", "-c", "/path/to/project", "build"]):
-            args = parse_args()
-            assert args.command == "build"
-            assert args.options == []
-            assert args.working_dir == "/path/to/project"
-
-        # Test with help option
-        with patch("sys.argv", ["actionman", "--help"]):
-            with pytest.raises(SystemExit):
-                parse_args()
-
-        # Test with version option
-        with patch("sys.argv", ["actionman", "--version"]):
-            with pytest.raises(SystemExit):
-                parse_args()
-
-    def test_clean_command(self):
-        """Test clean command in the command dispatch dictionary."""
-        mock_manager = MagicMock()
-        # Simulate how clean is called in the command dispatch dictionary
-        mock_manager.clean()
-        mock_manager.clean.assert_called_once()
-
-    def test_handle_build_command(self):
+        args = parse_args(argv)
+        assert isinstance(args, ParsedArgs)
+        assert args.command == command
+        assert args.options == options
+        assert args.working_dir == working_dir
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            # Unknown global option
+            ["--unknown", "build"],
+            # Missing working directory value
+            ["build", "--cd"],
+            ["--help"],
+            ["--version"],
+        ],
+    )
+    def test_parse_args_exits(self, argv):
+        """Test parse_args exits for help, version and invalid options."""
+        with pytest.raises(SystemExit):
+            parse_args(argv)
+
+    def test_split_long_opts(self):
+        """Test split_long_opts function."""
+        rest, values = split_long_opts(
+            ["release", "--prefix=/usr/local", "--other=1", "--flag"], ("prefix",)
+        )
+        assert rest == ["release", "--other=1", "--flag"]
+        assert values == {"prefix": "/usr/local"}
+
+        # The last occurrence of an option wins
+        rest, values = split_long_opts(["--prefix=/a", "--prefix=/b"], ("prefix",))
+        assert rest == []
+        assert values == {"prefix": "/b"}
+
+    def test_handle_clean_command(self, recording_manager):
+        """Test handle_clean_command function."""
+        handle_clean_command(recording_manager, [])
+        assert recording_manager.calls == [("clean", (), {})]
+
+    def test_handle_info_command(self, recording_manager):
+        """Test handle_info_command function."""
+        handle_info_command(recording_manager, [])
+        assert recording_manager.calls == [("system_info", (), {})]
+
+    @pytest.mark.parametrize(
+        "options, expected",
+        [
+            # No options: default build type
+            ([], ("build", ("debug", []), {})),
+            (["release"], ("build", ("release", []), {})),
+            (["all"], ("build_all", (), {})),
+            # Build type and flags
+            (["debug", "-DSOME_FLAG=ON"], ("build", ("debug", ["-DSOME_FLAG=ON"]), {})),
+        ],
+    )
+    def test_handle_build_command(self, recording_manager, options, expected):
         """Test handle_build_command function."""
-        mock_manager = MagicMock()
-
-        # Test with no options (default build type)
-        handle_build_command(mock_manager, [])
-        mock_manager.build.assert_called_once_with("debug", [])
-
-        # Test with build type
-        mock_manager.reset_mock()
-        handle_build_command(mock_manager, ["release"])
-        mock_manager.build.assert_called_once_with("release", [])
-
-        # Test with 'all' option
-        mock_manager.reset_mock()
-        handle_build_command(mock_manager, ["all"])
-        mock_manager.build_all.assert_called_once()
-
-        # Test with build type and flags
-        mock_manager.reset_mock()
-        handle_build_command(mock_manager, ["debug", "-DSOME_FLAG=ON"])
-        mock_manager.build.assert_called_once_with("debug", ["-DSOME_FLAG=ON"])
-
-    def test_handle_run_command(self):
+        handle_build_command(recording_manager, options)
+        assert recording_manager.calls == [expected]
+
+    @pytest.mark.parametrize(
+        "options, expected",
+        [
+            # No options: default build type
+            ([], ("run", ("debug", []), {})),
+            (["release"], ("run", ("release", []), {})),
+            # Build type and execution parameters
+            (
+                ["debug", "--verbose", "--option=value"],
+                ("run", ("debug", ["--verbose", "--option=value"]), {}),
+            ),
+        ],
+    )
+    def test_handle_run_command(self, recording_manager, options, expected):
         """Test handle_run_command function."""
-        mock_manager = MagicMock()
-
-        # Test with no options (default build type)
-        handle_run_command(mock_manager, [])
-        mock_manager.run.assert_called_once_with("debug", [])
-
-        # Test with build type
-        mock_manager.reset_mock()
-        handle_run_command(mock_manager, ["release"])
-        mock_manager.run.assert_called_once_with("release", [])
-
-        # Test with build type and execution parameters
-        mock_manager.reset_mock()
-        handle_run_command(mock_manager, ["debug", "--verbose", "--option=value"])
-        mock_manager.run.assert_called_once_with(
-            "debug", ["--verbose", "--option=value"]
-        )
-
-    def test_handle_test_command(self):
+        handle_run_command(recording_manager, options)
+        assert recording_manager.calls == [expected]
+
+    @pytest.mark.parametrize(
+        "options, expected",
+        [
+            # No options: default build type
+            ([], ("test", ("debug", ""), {})),
+            (["all"], ("test_all", (), {})),
+            (["all", "--unified"], ("test_all_unified", (), {})),
+            (["release"], ("test", ("release", ""), {})),
+            # Test filter, with and without a build type
+            (["TestCase"], ("test", ("debug", "TestCase"), {})),
+            (["release", "TestCase"], ("test", ("release", "TestCase"), {})),
+        ],
+    )
+    def test_handle_test_command(self, recording_manager, options, expected):
         """Test handle_test_command function."""
-        mock_manager = MagicMock()
-
-        # Test with no options (default build type)
-        handle_test_command(mock_manager, [])
-        mock_manager.test.assert_called_once_with("debug", "")
-
-        # Test with 'all' option
-        mock_manager.reset_mock()
-        handle_test_command(mock_manager, ["all"])
-        mock_manager.test_all.assert_called_once()
-
-        # Test with build type
-        mock_manager.reset_mock()
-        handle_test_command(mock_manager, ["release"])
-        mock_manager.test.assert_called_once_with("release", "")
-
-        # Test with test filter
-        mock_manager.reset_mock()
-        handle_test_command(mock_manager, ["TestCase"])
-        mock_manager.test.assert_called_once_with("debug", "TestCase")
-
-        # Test with build type and test filter
-        mock_manager.reset_mock()
-        handle_test_command(mock_manager, ["release", "TestCase"])
-        mock_manager.test.assert_called_once_with("release", "TestCase")
-
-    def test_handle_install_command(self):
+        handle_test_command(recording_manager, options)
+        assert recording_manager.calls == [expected]
+
+    @pytest.mark.parametrize(
+        "options, expected",
+        [
+            # No options: default build type
+            ([], ("install", ("debug", None), {})),
+            (["release"], ("install", ("release", None), {})),
+            # Prefix, with and without a build type
+            (["--prefix=/usr/local"], ("install", ("debug", "/usr/local"), {})),
+            (
+                ["release", "--prefix=/usr/local"],
+                ("install", ("release", "/usr/local"), {}),
+            ),
+        ],
+    )
+    def test_handle_install_command(self, recording_manager, options, expected):
         """Test handle_install_command function."""
-        mock_manager = MagicMock()
+        handle_install_command(recording_manager, options)
+        assert recording_manager.calls == [expected]
+
+    @pytest.mark.parametrize(
+        "args, working_dir, build_type",
+        [
+            (["build", "debug"], None, "debug"),
+            (["--cd", "/path/to/project", "build", "debug"], "/path/to/project", "debug"),
+            # Mixed-case commands are accepted
+            (["Build", "release"], None, "release"),
+        ],
+    )
+    @patch("actionman.cli.BuildManager")
+    def test_main(self, mock_build_manager_class, args, working_dir, build_type):
+        """Test main function."""
+        main(args)
 
-        # Test with no options (default build type)
-        handle_install_command(mock_manager, [])
-        mock_manager.install.assert_called_once_with("debug", None)
+        # Verify BuildManager was initialized with the working directory
+        mock_build_manager_class.assert_called_once_with(working_dir or os.getcwd())
 
-        # Test with build type
-        mock_manager.reset_mock()
-        handle_install_command(mock_manager, ["release"])
-        mock_manager.install.assert_called_once_with("release", None)
+        # Verify the correct command handler was called
+        mock_manager = mock_build_manager_class.return_value
+        mock_manager.build.assert_called_once_with(build_type, [])
 
-        # Test with prefix
-        mock_manager.reset_mock()
-        handle_install_command(mock_manager, ["--prefix=/usr/local"])
-        mock_manager.install.assert_called_once_with("debug", "/usr/local")
+    @patch("sys.exit")
+    @patch("actionman.cli.BuildManager")
+    def test_main_unknown_command(self, mock_build_manager_class, mock_exit, capsys):
+        """Test main function with an unknown command."""
+        main(["unknown"])
 
-        # Test with build type and prefix
-        mock_manager.reset_mock()
-        handle_install_command(mock_manager, ["release", "--prefix=/usr/local"])
-        mock_manager.install.assert_called_once_with("release", "/usr/local")
+        # Verify sys.exit was called without creating a manager
+        mock_exit.assert_called_once_with(1)
+        mock_build_manager_class.assert_not_called()
 
-    def test_main(self):
-        """Test main function."""
-        # Mock parse_args and BuildManager
-        with patch("actionman.cli.parse_args") as mock_parse_args:
-            with patch("actionman.cli.BuildManager") as mock_build_manager_class:
-                # Set up mock return values
-                mock_args = MagicMock()
-                mock_args.command = "build"
-                mock_args.options = ["debug"]
-                mock_args.working_dir = None
-                mock_parse_args.return_value = mock_args
-
-                mock_manager = MagicMock()
-                mock_build_manager_class.return_value = mock_manager
+        # Verify the error and help were printed
+        out = capsys.readouterr().out
+        assert "Unknown command: unknown" in out
+        assert "Usage:" in out
 
-                # Call main
-                main()
+    @patch("actionman.cli.BuildManager")
+    def test_main_no_command(self, mock_build_manager_class, capsys):
+        """Test main function with options but no command shows help."""
+        main(["--cd", "/path/to/project"])
 
-                # Verify BuildManager was initialized correctly
-                mock_build_manager_class.assert_called_once_with(os.getcwd())
+        # Verify help was printed and no BuildManager was created
+        assert "Usage:" in capsys.readouterr().out
+        mock_build_manager_class.assert_not_called()
 
-                # Verify the correct command handler was called
-                mock_manager.build.assert_called_once_with("debug", [])
+    def test_main_command_failure(self, capsys):
+        """Test main reports a failed command and exits with an error."""
+        with patch("actionman.cli.BuildManager") as mock_build_manager_class:
+            mock_manager = mock_build_manager_class.return_value
+            mock_manager.test.side_effect = subprocess.CalledProcessError(8, ["ctest"])
 
-        # Test with working directory
-        with patch("actionman.cli.parse_args") as mock_parse_args:
-            with patch("actionman.cli.BuildManager") as mock_build_manager_class:
-                # Set up mock return values
-                mock_args = MagicMock()
-                mock_args.command = "build"
-                mock_args.options = ["debug"]
-                mock_args.working_dir = "/path/to/project"
-                mock_parse_args.return_value = mock_args
+            with pytest.raises(SystemExit) as excinfo:
+                main(["test", "release"])
 
-                mock_manager = MagicMock()
-                mock_build_manager_class.return_value = mock_manager
+            assert excinfo.value.code == 1
+            assert "Command failed" in capsys.readouterr().out
 
-                # Call main
-                main()
+    def test_main_no_args(self, capsys):
+        """Test main function with no arguments prints help."""
+        with patch("actionman.cli.BuildManager") as mock_build_manager_class:
+            main([])
 
-                # Verify BuildManager was initialized with working directory
-                mock_build_manager_class.assert_called_once_with("/path/to/project")
+            assert "Usage:" in capsys.readouterr().out
+            mock_build_manager_class.assert_not_called()
 
-        # Test with unknown command
+    def test_main_help_and_version(self, capsys):
+        """Test main function short-circuits help and version flags."""
         with patch("actionman.cli.parse_args") as mock_parse_args:
-            with patch("actionman.cli.BuildManager") as mock_build_manager_class:
-                with patch("sys.exit") as mock_exit:
-                    # Set up mock return values
-                    mock_args = MagicMock()
-                    mock_args.command = "unknown"
-                    mock_args.options = []
-                    mock_args.working_dir = None
-                    mock_parse_args.return_value = mock_args
+            main(["--help"])
+            assert "Usage:" in capsys.readouterr().out
 
-                    mock_manager = MagicMock()
-                    mock_build_manager_class.return_value = mock_manager
+            main(["-v"])
+            assert capsys.readouterr().out.strip().startswith("ActionMan v")
 
-                    # Call main
-                    main()
-
-                    # Verify sys.exit was called
-                    mock_exit.assert_called_once_with(1)
-
-        # Test with no command (should show help)
-        with patch("actionman.cli.parse_args") as mock_parse_args:
-            with patch("actionman.cli.BuildManager") as mock_build_manager_class:
-                # Set up mock return values
-                mock_args = MagicMock()
-                mock_args.command = None
-                mock_args.options = []
-                mock_args.working_dir = None
-                mock_parse_args.return_value = mock_args
-
-                mock_manager = MagicMock()
-                mock_build_manager_class.return_value = mock_manager
-
-                # Call main
-                main()
-
-                # Verify print_help was called
-                mock_manager.print_help.assert_called_once()
+            mock_parse_args.assert_not_called()
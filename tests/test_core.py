@@ -8,14 +8,15 @@ for all build-related operations in the ActionMan tool.
 """
 
 import os
+from unittest.mock import MagicMock, patch
+
 import pytest
-from unittest.mock import patch, MagicMock
 
 from actionman.core import BuildManager
 from actionman.modules.build_operations import BuildOperations
 from actionman.modules.run_operations import RunOperations
-from actionman.modules.test_operations import TestingOperations
 from actionman.modules.system_operations import SystemOperations
+from actionman.modules.test_operations import TestingOperations
 
 
 class TestBuildManager:
@@ -40,6 +41,14 @@ class TestBuildManager:
         assert manager.cwd == temp_dir
         assert manager.build_dir == os.path.join(temp_dir, "build")
 
+    def test_package_export(self):
+        """Test BuildManager is lazily exported from the package."""
+        import actionman
+
+        assert actionman.BuildManager is BuildManager
+        with pytest.raises(AttributeError):
+            actionman.NotAnAttribute
+
     def test_init_invalid_directory(self):
         """Test BuildManager initialization with invalid directory."""
         # Test with non-existent directory
@@ -58,7 +67,7 @@ class TestBuildManager:
         with patch.object(build_manager.build_ops, "configure") as mock_configure:
             # Test with default parameters
             build_manager.configure()
-            mock_configure.assert_called_once_with("debug", [])
+            mock_configure.assert_called_once_with("debug", None)
 
             # Test with custom parameters
             mock_configure.reset_mock()
@@ -71,7 +80,7 @@ class TestBuildManager:
         with patch.object(build_manager.build_ops, "build") as mock_build:
             # Test with default parameters
             build_manager.build()
-            mock_build.assert_called_once_with("debug", [])
+            mock_build.assert_called_once_with("debug", None)
 
             # Test with custom parameters
             mock_build.reset_mock()
@@ -84,7 +93,7 @@ class TestBuildManager:
         with patch.object(build_manager.run_ops, "run") as mock_run:
             # Test with default parameters
             build_manager.run()
-            mock_run.assert_called_once_with("debug", [])
+            mock_run.assert_called_once_with("debug", None)
 
             # Test with custom parameters
             mock_run.reset_mock()
@@ -119,12 +128,12 @@ class TestBuildManager:
         with patch.object(build_manager.test_ops, "test") as mock_test:
             # Test with default parameters
             build_manager.test()
-            mock_test.assert_called_once_with("debug", "")
+            mock_test.assert_called_once_with("debug", "", None)
 
             # Test with custom parameters
             mock_test.reset_mock()
             build_manager.test("release", "TestCase")
-            mock_test.assert_called_once_with("release", "TestCase")
+            mock_test.assert_called_once_with("release", "TestCase", None)
 
     def test_test_all(self, build_manager):
         """Test test_all method."""
@@ -8,11 +8,12 @@ running C++ executables built with CMake.
 """
 
 import os
+from unittest.mock import patch
+
 import pytest
-from unittest.mock import patch, MagicMock
 
 from actionman.modules.run_operations import RunOperations
-from actionman.utils import CMAKE_BUILD_MAP
+from actionman.utils import is_executable
 
 
 class TestRunOperations:
@@ -29,9 +30,8 @@ class TestRunOperations:
         # Test finding executable for debug build
         executable = run_operations._find_executable("debug")
         assert executable is not None
-        assert os.path.exists(executable)
-        assert os.path.isfile(executable)
-        assert os.access(executable, os.X_OK)
+        # One stat checks that it exists, is a regular file and is executable
+        assert is_executable(executable)
 
         # Verify the executable is in the correct directory
         assert os.path.join(mock_build_dir, "Debug") in executable
@@ -39,7 +39,7 @@ class TestRunOperations:
         # Test finding executable for release build
         executable = run_operations._find_executable("release")
         assert executable is not None
-        assert os.path.exists(executable)
+        assert is_executable(executable)
         assert os.path.join(mock_build_dir, "Release") in executable
 
     def test_find_executable_not_found(self, run_operations, temp_dir):
@@ -90,19 +90,13 @@ class TestRunOperations:
     def test_run_build_if_not_found(self, run_operations, mock_command_runner):
         """Test run method builds the executable if not found."""
         # Mock _find_executable to raise FileNotFoundError on first call, then return a path
-        original_find_executable = run_operations._find_executable
-        call_count = 0
-
-        def mock_find_executable(build_type):
-            nonlocal call_count
-            if call_count == 0:
-                call_count += 1
-                raise FileNotFoundError("Executable not found")
-            return original_find_executable(build_type)
+        executable = run_operations._find_executable("debug")
 
         with patch.object(
-            run_operations, "_find_executable", side_effect=mock_find_executable
-        ):
+            run_operations,
+            "_find_executable",
+            side_effect=[FileNotFoundError("Executable not found"), executable],
+        ) as mock_find_executable:
             # Mock the build method to track calls
             with patch.object(run_operations.build_ops, "build") as mock_build:
                 run_operations.run("debug")
@@ -114,3 +108,4 @@ class TestRunOperations:
                 assert len(mock_command_runner["history"]) > 0
                 last_command = mock_command_runner["history"][-1]
                 assert "test_executable" in last_command["cmd"][0]
+                assert mock_find_executable.call_count == 2
@@ -8,8 +8,9 @@ testing C++ projects built with CMake.
 """
 
 import os
+from unittest.mock import ANY, patch
+
 import pytest
-from unittest.mock import patch, MagicMock
 
 from actionman.modules.test_operations import TestingOperations
 from actionman.utils import CMAKE_BUILD_MAP
@@ -57,6 +58,20 @@ class TestTestingOperations:
         filter_index = last_command["cmd"].index("-R")
         assert last_command["cmd"][filter_index + 1] == test_filter
 
+    def test_test_parallel(self, test_operations, mock_command_runner, monkeypatch):
+        """Test ctest runs in parallel unless CTEST_PARALLEL_LEVEL is set."""
+        monkeypatch.delenv("CTEST_PARALLEL_LEVEL", raising=False)
+        test_operations.test(jobs=3)
+        cmd = mock_command_runner["history"][-1]["cmd"]
+        assert cmd[cmd.index("--parallel") + 1] == "3"
+
+        test_operations.test()
+        assert "--parallel" in mock_command_runner["history"][-1]["cmd"]
+
+        monkeypatch.setenv("CTEST_PARALLEL_LEVEL", "2")
+        test_operations.test()
+        assert "--parallel" not in mock_command_runner["history"][-1]["cmd"]
+
     def test_test_build_if_not_found(self, test_operations, mock_command_runner):
         """Test test method builds the project if build directory not found."""
         # Mock os.path.exists to return False for build_dir
@@ -73,25 +88,45 @@ class TestTestingOperations:
                 last_command = mock_command_runner["history"][-1]
                 assert "ctest" in last_command["cmd"]
 
-    def test_test_all(self, test_operations, mock_command_runner):
+    @pytest.mark.parametrize("build_type", list(CMAKE_BUILD_MAP))
+    def test_test_all(self, test_operations, mock_command_runner, build_type):
         """Test test_all method."""
         # Mock the test method to track calls
         with patch.object(test_operations, "test") as mock_test:
             test_operations.test_all()
 
-            # Verify that test was called for each build type
-            assert mock_test.call_count == len(CMAKE_BUILD_MAP)
+        # Verify that test was called once per build type, including this one
+        assert mock_test.call_count == len(CMAKE_BUILD_MAP)
+        mock_test.assert_any_call(build_type, jobs=ANY)
 
-            # Verify that each build type was tested
-            called_build_types = [call[0][0] for call in mock_test.call_args_list]
-            for build_type in CMAKE_BUILD_MAP.keys():
-                assert build_type in called_build_types
+    def test_test_all_unified(self, test_operations, mock_command_runner):
+        """Test test_all_unified runs one ctest over every build tree."""
+        build_ops = test_operations.build_ops
+        for build_type in CMAKE_BUILD_MAP:
+            os.makedirs(build_ops.config_dir(build_type), exist_ok=True)
+
+        test_operations.test_all_unified()
+
+        assert len(mock_command_runner["history"]) == 1
+        last_command = mock_command_runner["history"][-1]
+        assert "ctest" in last_command["cmd"]
+        assert last_command["cwd"] == test_operations.build_dir
+
+        with open(os.path.join(test_operations.build_dir, "CTestTestfile.cmake")) as f:
+            testfile = f.read()
+        for cmake_type in CMAKE_BUILD_MAP.values():
+            # Each configuration's tests are labelled with its build type
+            assert (
+                f'set(ACTIONMAN_LABEL "{cmake_type}")\nsubdirs("{cmake_type}")'
+                in testfile
+            )
+        assert 'set_directory_properties(PROPERTIES LABELS "${ACTIONMAN_LABEL}")' in testfile
 
     def test_test_all_with_failures(self, test_operations):
         """Test test_all method when some tests fail."""
 
         # Mock the test method to raise SystemExit for some build types
-        def mock_test(build_type, test_filter=""):
+        def mock_test(build_type, test_filter="", jobs=None):
             if build_type == "release":
                 raise SystemExit(1)
 
@@ -102,3 +137,17 @@ class TestTestingOperations:
 
                 # Verify that sys.exit was called with error code
                 mock_exit.assert_called_once_with(1)
+
+    def test_test_all_with_failures_fail_fast(self, test_operations, monkeypatch):
+        """Test test_all stops at the first failure with ACTIONMAN_FAIL_FAST=1."""
+        monkeypatch.setenv("ACTIONMAN_FAIL_FAST", "1")
+        first_type = next(iter(CMAKE_BUILD_MAP))
+
+        with patch.object(
+            test_operations, "test", side_effect=SystemExit(1)
+        ) as mock_test:
+            with patch("sys.exit") as mock_exit:
+                test_operations.test_all()
+
+        mock_test.assert_called_once_with(first_type, jobs=None)
+        mock_exit.assert_called_once_with(1)
@@ -8,20 +8,25 @@ This module contains tests for the utility functions used across the ActionMan p
 
 import os
 import platform
-import sys
+import stat
 import subprocess
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
 import pytest
-from unittest.mock import patch, MagicMock
 
 from actionman.utils import (
+    CMAKE_BUILD_MAP,
     colorize,
-    print_separator,
-    run_command,
-    handle_errors,
+    find_executable,
     get_system_info,
+    handle_errors,
     is_executable,
-    find_executable,
-    CMAKE_BUILD_MAP,
+    map_grouped,
+    print_separator,
+    print_summary,
+    run_command,
 )
 
 
@@ -40,75 +45,173 @@ class TestUtils:
             assert "\033[31m" in colored_text
             assert "\033[0m" in colored_text
 
-        # Test with invalid color (should use default)
-        colored_text = colorize("test", "invalid_color")
-        assert colored_text == "test\033[0m" or colored_text == "test"
+        # Test with invalid color (left uncolored, without a stray reset)
+        assert colorize("test", "invalid_color") == "test"
 
-    def test_print_separator(self):
+    def test_print_separator(self, capsys):
         """Test print_separator function."""
         # Test with default parameters
-        with patch("builtins.print") as mock_print:
-            print_separator()
-            mock_print.assert_called_once_with("=" * 80)
+        print_separator()
+        assert capsys.readouterr().out == "=" * 80 + "\n"
 
         # Test with message
-        with patch("builtins.print") as mock_print:
-            with patch(
-                "actionman.utils.colorize", return_value="COLORED_MESSAGE"
-            ) as mock_colorize:
-                print_separator("Test Message", "red")
-                mock_colorize.assert_called_once_with("Test Message", "red")
-                assert mock_print.call_count == 1
-                # Check that the printed string contains the colored message
-                printed_str = mock_print.call_args[0][0]
-                assert "COLORED_MESSAGE" in printed_str
-                # Check that the printed string has the correct length
-                # The actual length might vary slightly due to padding calculations
-                assert len(printed_str) >= 80
-
-    def test_run_command(self):
+        with patch(
+            "actionman.utils.colorize", return_value="COLORED_MESSAGE"
+        ) as mock_colorize:
+            print_separator("Test Message", "red")
+            mock_colorize.assert_called_once_with("Test Message", "red")
+
+        # Check that one line was printed containing the colored message
+        printed_str = capsys.readouterr().out
+        assert printed_str.count("\n") == 1
+        assert "COLORED_MESSAGE" in printed_str
+        # Check that the printed string has the correct length
+        # The actual length might vary slightly due to padding calculations
+        assert len(printed_str.rstrip("\n")) >= 80
+
+    def test_print_summary(self):
+        """Test print_summary writes all rows in one call."""
+        with patch("actionman.utils.print_separator") as mock_separator:
+            with patch("sys.stdout") as mock_stdout:
+                print_summary("BUILD SUMMARY", [("debug", True, 1.5), ("release", False, 2.0)])
+
+                mock_separator.assert_called_once_with("BUILD SUMMARY", "bold")
+                mock_stdout.write.assert_called_once()
+                output = mock_stdout.write.call_args[0][0]
+                assert output.count("\n") == 2
+                assert "debug" in output and "SUCCESS" in output and "(1.50s)" in output
+                assert "release" in output and "FAILED" in output
+
+    def test_map_grouped(self, capsys):
+        """Test map_grouped keeps each call's output together."""
+        barrier = threading.Barrier(2)
+
+        def work(name):
+            print(f"{name} start")
+            barrier.wait(timeout=5)
+            print(f"{name} error", file=sys.stderr)
+            print(f"{name} end")
+            return name.upper()
+
+        assert map_grouped(work, ["a", "b"]) == ["A", "B"]
+
+        out, err = capsys.readouterr()
+        lines = out.splitlines()
+        assert sorted(lines) == ["a end", "a start", "b end", "b start"]
+        # Both calls were running at once, yet their lines are not interleaved
+        for name in ("a", "b"):
+            start = lines.index(f"{name} start")
+            assert lines[start + 1] == f"{name} end"
+        assert sorted(err.splitlines()) == ["a error", "b error"]
+
+    def test_map_grouped_helper_threads(self, capsys):
+        """Test helper threads can write into the calling thread's group."""
+        barrier = threading.Barrier(2)
+
+        def work(name):
+            print(f"{name} start")
+            sink = sys.stdout.for_current_thread()
+            helper = threading.Thread(target=sink.write, args=(f"{name} helper\n",))
+            helper.start()
+            helper.join()
+            barrier.wait(timeout=5)
+            print(f"{name} end")
+
+        map_grouped(work, ["a", "b"])
+
+        lines = capsys.readouterr().out.splitlines()
+        for name in ("a", "b"):
+            start = lines.index(f"{name} start")
+            assert lines[start + 1 : start + 3] == [f"{name} helper", f"{name} end"]
+
+    @pytest.fixture
+    def mock_subprocess_run(self, monkeypatch) -> MagicMock:
+        """Replace subprocess.run for the whole test with one successful mock."""
+        mock_run = MagicMock()
+        mock_run.return_value.returncode = 0
+        mock_run.return_value.stdout = "test output"
+        mock_run.return_value.stderr = ""
+        monkeypatch.setattr(subprocess, "run", mock_run)
+        return mock_run
+
+    def test_run_command(self, mock_subprocess_run):
         """Test run_command function."""
-        # Mock subprocess.run
-        mock_process = MagicMock()
-        mock_process.returncode = 0
-        mock_process.stdout = "test output"
-        mock_process.stderr = ""
-
-        with patch("subprocess.run", return_value=mock_process) as mock_run:
-            returncode, stdout, stderr = run_command(["test", "command"])
-
-            # Verify subprocess.run was called correctly
-            mock_run.assert_called_once()
-            args, kwargs = mock_run.call_args
-            assert args[0] == ["test", "command"]
-            assert kwargs["capture_output"] is True
-            assert kwargs["text"] is True
-
-            # Verify return values
-            assert returncode == 0
-            assert stdout == "test output"
-            assert stderr == ""
+        returncode, stdout, stderr = run_command(["test", "command"])
 
-        # Test with error
-        mock_process.returncode = 1
-        mock_process.stderr = "error message"
+        # Verify subprocess.run was called correctly
+        mock_subprocess_run.assert_called_once()
+        args, kwargs = mock_subprocess_run.call_args
+        assert args[0] == ["test", "command"]
+        assert kwargs["capture_output"] is True
+        assert kwargs["text"] is True
 
-        with patch("subprocess.run", return_value=mock_process) as mock_run:
-            returncode, stdout, stderr = run_command(["test", "command"])
-            assert returncode == 1
-            assert stderr == "error message"
+        # Verify return values
+        assert returncode == 0
+        assert stdout == "test output"
+        assert stderr == ""
 
-        # Test with custom working directory
-        with patch("subprocess.run", return_value=mock_process) as mock_run:
-            returncode, stdout, stderr = run_command(
-                ["test", "command"], cwd="/custom/dir"
-            )
+        # Test with error
+        mock_subprocess_run.return_value.returncode = 1
+        mock_subprocess_run.return_value.stderr = "error message"
 
-            # Verify subprocess.run was called with correct cwd
-            args, kwargs = mock_run.call_args
-            assert kwargs["cwd"] == "/custom/dir"
+        returncode, stdout, stderr = run_command(["test", "command"])
+        assert returncode == 1
+        assert stderr == "error message"
 
-    def test_handle_errors_decorator(self):
+        # Test with custom working directory
+        run_command(["test", "command"], cwd="/custom/dir")
+        args, kwargs = mock_subprocess_run.call_args
+        assert kwargs["cwd"] == "/custom/dir"
+
+        # Test with timeout
+        run_command(["test", "command"], timeout=2)
+        args, kwargs = mock_subprocess_run.call_args
+        assert kwargs["timeout"] == 2
+
+    def test_run_command_stream(self, capsys):
+        """Test run_command echoes output as it arrives when streaming."""
+        returncode, stdout, stderr = run_command(
+            [
+                sys.executable,
+                "-c",
+                "import sys; print('line 1'); print('line 2'); "
+                "print('oops', file=sys.stderr); sys.exit(3)",
+            ],
+            stream=True,
+        )
+
+        # Output is both returned and echoed to the console
+        assert returncode == 3
+        assert stdout == "line 1\nline 2\n"
+        assert stderr == "oops\n"
+        captured = capsys.readouterr()
+        assert captured.out == "line 1\nline 2\n"
+        assert captured.err == "oops\n"
+
+    def test_run_command_stream_keeps_tail(self, capsys):
+        """Test run_command only keeps the tail of streamed output."""
+        returncode, stdout, stderr = run_command(
+            [sys.executable, "-c", "print('x' * 100000); print('end')"],
+            stream=True,
+        )
+
+        assert returncode == 0
+        assert stdout.endswith("end\n")
+        assert len(stdout) < 100000
+        # Everything was still shown on the console
+        assert len(capsys.readouterr().out) > 100000
+
+    def test_run_command_no_capture(self, mock_subprocess_run):
+        """Test run_command lets the command inherit the console."""
+        mock_subprocess_run.return_value.returncode = 2
+
+        returncode, stdout, stderr = run_command(["test", "command"], capture=False)
+
+        args, kwargs = mock_subprocess_run.call_args
+        assert "capture_output" not in kwargs
+        assert (returncode, stdout, stderr) == (2, "", "")
+
+    def test_handle_errors_decorator(self, capsys):
         """Test handle_errors decorator."""
 
         # Create a test function with the decorator
@@ -118,30 +221,39 @@ class TestUtils:
                 raise KeyError("test_key")
             elif arg1 == "raise_subprocess_error":
                 raise subprocess.CalledProcessError(1, "test_cmd")
+            elif arg1 == "raise_file_not_found":
+                raise FileNotFoundError("test_file")
             return f"Success: {arg1}, {arg2}"
 
         # Test normal execution
         assert test_func("test", "arg2") == "Success: test, arg2"
 
         # Test with KeyError
-        with patch("builtins.print") as mock_print:
-            with patch("sys.exit") as mock_exit:
-                test_func("raise_key_error")
+        with patch("sys.exit") as mock_exit:
+            test_func("raise_key_error")
 
-                # Verify error was printed
-                assert mock_print.call_count >= 2
-                # Verify sys.exit was called
-                mock_exit.assert_called_once_with(1)
+            # Verify sys.exit was called
+            mock_exit.assert_called_once_with(1)
+        # Verify the error and the valid build types were printed
+        out = capsys.readouterr().out
+        assert "Invalid build type" in out
+        assert "Available build types" in out
 
         # Test with CalledProcessError
-        with patch("builtins.print") as mock_print:
-            with patch("sys.exit") as mock_exit:
-                test_func("raise_subprocess_error")
+        with patch("sys.exit") as mock_exit:
+            test_func("raise_subprocess_error")
 
-                # Verify error was printed
-                assert mock_print.call_count >= 1
-                # Verify sys.exit was called
-                mock_exit.assert_called_once_with(1)
+            # Verify sys.exit was called
+            mock_exit.assert_called_once_with(1)
+        # Verify error was printed
+        assert "Command failed" in capsys.readouterr().out
+
+        # Other errors pass through for the caller to handle, as
+        # RunOperations.run does when no executable is found
+        with patch("sys.exit") as mock_exit:
+            with pytest.raises(FileNotFoundError):
+                test_func("raise_file_not_found")
+            mock_exit.assert_not_called()
 
     def test_get_system_info(self):
         """Test get_system_info function."""
@@ -159,6 +271,12 @@ class TestUtils:
         assert isinstance(info["python"], str)
         assert isinstance(info["cpu_count"], str)
 
+        # Each caller gets an equal copy that it can change freely
+        other = get_system_info()
+        assert other == info
+        other["os"] = "changed"
+        assert get_system_info() == info
+
         # Verify the values contain expected information
         assert platform.system() in info["os"]
         assert platform.machine() in info["architecture"]
@@ -186,37 +304,55 @@ class TestUtils:
         # Test non-existent file
         assert not is_executable(os.path.join(temp_dir, "non_existent.txt"))
 
-    def test_find_executable(self):
+    @pytest.mark.skipif(os.name == "nt", reason="Windows has no execute bit")
+    @pytest.mark.parametrize(
+        "mode, expected",
+        [
+            (stat.S_IFREG | 0o755, True),
+            (stat.S_IFREG | 0o700, True),
+            (stat.S_IFREG | 0o644, False),
+            (stat.S_IFDIR | 0o755, False),
+        ],
+    )
+    def test_is_executable_mode(self, monkeypatch, mode, expected):
+        """Test is_executable decides from the file mode alone."""
+        fake_stat = os.stat_result((mode, 0, 0, 1, 0, 0, 0, 0, 0, 0))
+        monkeypatch.setattr(os, "stat", lambda path: fake_stat)
+
+        assert is_executable("/fake/path") is expected
+
+    def test_find_executable(self, temp_dir):
         """Test find_executable function."""
-        # Mock is_executable to control behavior
-        with patch("actionman.utils.is_executable") as mock_is_executable:
-            # Test with absolute path that exists
-            mock_is_executable.return_value = True
-            result = find_executable("/usr/bin/python")
-            assert result == "/usr/bin/python"
-
-            # Test with absolute path that doesn't exist
-            mock_is_executable.return_value = False
-            result = find_executable("/usr/bin/nonexistent")
-            assert result is None
+        find_executable.cache_clear()
+
+        # Test with a path to an executable file
+        exec_file = os.path.join(temp_dir, "exec.sh")
+        with open(exec_file, "w") as f:
+            f.write("#!/bin/sh\necho test")
+        os.chmod(exec_file, 0o755)
+        assert find_executable(exec_file) == exec_file
+
+        # Test with a path that doesn't exist
+        assert find_executable(os.path.join(temp_dir, "nonexistent")) is None
 
         # Test with name that should be in PATH
-        with patch("os.path.join", return_value="/usr/bin/python") as mock_join:
-            with patch(
-                "actionman.utils.is_executable", return_value=True
-            ) as mock_is_executable:
-                result = find_executable("python")
-                assert result == "/usr/bin/python"
+        with patch("shutil.which", return_value="/usr/bin/python") as mock_which:
+            assert find_executable("python") == "/usr/bin/python"
+            mock_which.assert_called_once_with("python")
 
         # Test with name that is not in PATH
-        with patch(
-            "os.environ.get", return_value="/usr/bin:/usr/local/bin"
-        ) as mock_environ_get:
-            with patch(
-                "actionman.utils.is_executable", return_value=False
-            ) as mock_is_executable:
-                result = find_executable("nonexistent")
-                assert result is None
+        with patch("shutil.which", return_value=None):
+            assert find_executable("nonexistent") is None
+        find_executable.cache_clear()
+
+    def test_find_executable_cached(self):
+        """Test find_executable searches the PATH once per name."""
+        find_executable.cache_clear()
+        with patch("shutil.which", return_value=None) as mock_which:
+            assert find_executable("nonexistent") is None
+            assert find_executable("nonexistent") is None
+            mock_which.assert_called_once_with("nonexistent")
+        find_executable.cache_clear()
 
     def test_cmake_build_map(self):
         """Test CMAKE_BUILD_MAP constant."""